@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Media checks and optimization for addon packaging.
+
+Textures under the addon's media/ folder are:
+- validated: TGA files must parse and have power-of-two dimensions
+- re-encoded: each TGA is written in whichever lossless variant deflates
+  smallest in the zip (run-length encoded or not, 24-bit when the alpha
+  channel is fully opaque); the image ID and TGA 2.0 footer are dropped
+- pruned: media files that no Lua/XML file or TOC line refers to are left
+  out of the package
+
+References are found by looking for `media\\...` paths anywhere in those
+files, case-insensitively and with or without the file extension, as WoW
+resolves them. A reference ending in a separator (e.g., a path prefix
+that is concatenated with a name at runtime) keeps everything below it.
+
+addon_packer.py applies this while zipping; validate_packaging.py reports
+problems before the package is built.
+
+Usage:
+    python3 addon_media.py SpectrumFederation
+"""
+
+import argparse
+import functools
+import hashlib
+import itertools
+import re
+import struct
+import sys
+import zlib
+from collections import namedtuple
+from pathlib import Path
+
+
+MEDIA_DIR = "media"
+
+# Files scanned for media references
+REFERENCE_SUFFIXES = {".lua", ".xml", ".toc"}
+
+# Extensions WoW lets a texture/sound/font path omit
+MEDIA_SUFFIXES = {".tga", ".blp", ".ogg", ".mp3", ".ttf", ".png", ".jpg"}
+
+REFERENCE_PATTERN = re.compile(r"\bmedia[\\/][\w\\/.-]*", re.IGNORECASE)
+
+TGA_HEADER = struct.Struct("<BBBHHBHHHHBB")
+
+# Image types: uncompressed/RLE true-color and grayscale; color-mapped images are not supported
+TGA_TRUE_COLOR = 2
+TGA_GRAYSCALE = 3
+TGA_RLE_TRUE_COLOR = 10
+TGA_RLE_GRAYSCALE = 11
+TGA_RLE_OFFSET = 8
+
+TGA_ORIGIN_BITS = 0x30
+TGA_MAX_PACKET = 128
+
+# Same level the packer deflates with, so candidates are compared by what actually ships
+SIZE_COMPRESSLEVEL = 6
+
+Tga = namedtuple("Tga", ["width", "height", "bits", "grayscale", "rle", "descriptor", "pixels"])
+
+
+@functools.cache
+def source_hash():
+    """Return a short hash of this module, for build cache keys."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+
+def is_power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+def _rle_decode(data, offset, count, pixel_size):
+    pixels = bytearray()
+    end = count * pixel_size
+    while len(pixels) < end:
+        if offset >= len(data):
+            raise ValueError("truncated RLE pixel data")
+        header = data[offset]
+        offset += 1
+        length = (header & 0x7F) + 1
+        if header & 0x80:
+            pixel = data[offset:offset + pixel_size]
+            offset += pixel_size
+            pixels += pixel * length
+        else:
+            pixels += data[offset:offset + length * pixel_size]
+            offset += length * pixel_size
+    if len(pixels) != end:
+        raise ValueError("RLE packet crosses the end of the image")
+    return bytes(pixels)
+
+
+def read_tga(data):
+    """
+    Parse a TGA image.
+
+    Args:
+        data: File content
+
+    Returns:
+        Tga: Dimensions, format and decoded pixel rows (in file order)
+
+    Raises:
+        ValueError: If the file is truncated or not a supported TGA type
+    """
+    if len(data) < TGA_HEADER.size:
+        raise ValueError("file is too short for a TGA header")
+    (id_length, colormap_type, image_type, _, colormap_length, _, _, _,
+     width, height, bits, descriptor) = TGA_HEADER.unpack_from(data)
+
+    if colormap_type or colormap_length:
+        raise ValueError("color-mapped TGA images are not supported")
+    if image_type not in (TGA_TRUE_COLOR, TGA_GRAYSCALE, TGA_RLE_TRUE_COLOR, TGA_RLE_GRAYSCALE):
+        raise ValueError(f"unsupported TGA image type {image_type}")
+    grayscale = image_type in (TGA_GRAYSCALE, TGA_RLE_GRAYSCALE)
+    if bits not in ((8,) if grayscale else (24, 32)):
+        raise ValueError(f"unsupported pixel depth {bits} for TGA image type {image_type}")
+
+    offset = TGA_HEADER.size + id_length
+    pixel_size = bits // 8
+    count = width * height
+    rle = image_type >= TGA_RLE_OFFSET
+    if rle:
+        pixels = _rle_decode(data, offset, count, pixel_size)
+    else:
+        pixels = data[offset:offset + count * pixel_size]
+        if len(pixels) != count * pixel_size:
+            raise ValueError("truncated pixel data")
+    return Tga(width, height, bits, grayscale, rle, descriptor, pixels)
+
+
+def _rle_encode(pixels, width, pixel_size):
+    """Run-length encode pixel rows; packets never cross a scanline."""
+    out = bytearray()
+    row_size = width * pixel_size
+    for row_start in range(0, len(pixels), row_size):
+        row = pixels[row_start:row_start + row_size]
+        literal = []
+
+        def flush_literal():
+            for start in range(0, len(literal), TGA_MAX_PACKET):
+                chunk = literal[start:start + TGA_MAX_PACKET]
+                out.append(len(chunk) - 1)
+                out.extend(b"".join(chunk))
+            literal.clear()
+
+        row_pixels = (row[i:i + pixel_size] for i in range(0, row_size, pixel_size))
+        for pixel, group in itertools.groupby(row_pixels):
+            run = sum(1 for _ in group)
+            if run == 1:
+                literal.append(pixel)
+                continue
+            flush_literal()
+            while run:
+                length = min(run, TGA_MAX_PACKET)
+                out.append(0x80 | (length - 1))
+                out.extend(pixel)
+                run -= length
+        flush_literal()
+    return bytes(out)
+
+
+def encode_tga(tga, rle):
+    """Encode a Tga with no image ID, color map or footer."""
+    pixel_size = tga.bits // 8
+    image_type = TGA_GRAYSCALE if tga.grayscale else TGA_TRUE_COLOR
+    if rle:
+        image_type += TGA_RLE_OFFSET
+        body = _rle_encode(tga.pixels, tga.width, pixel_size)
+    else:
+        body = tga.pixels
+    header = TGA_HEADER.pack(0, 0, image_type, 0, 0, 0, 0, 0, tga.width, tga.height, tga.bits, tga.descriptor)
+    return header + body
+
+
+def _drop_opaque_alpha(tga):
+    """Return a 24-bit copy of a 32-bit image whose alpha is 255 everywhere, else None."""
+    if tga.bits != 32 or tga.pixels[3::4].count(255) != tga.width * tga.height:
+        return None
+    rgb = bytearray(len(tga.pixels) // 4 * 3)
+    for channel in range(3):
+        rgb[channel::3] = tga.pixels[channel::4]
+    return tga._replace(bits=24, descriptor=tga.descriptor & TGA_ORIGIN_BITS, pixels=bytes(rgb))
+
+
+def optimize_tga(data):
+    """
+    Return the smallest lossless encoding of a TGA, as it would ship deflated.
+
+    Candidates are checked by decoding them again; the original bytes are
+    returned if they cannot be parsed or nothing beats them.
+    """
+    try:
+        tga = read_tga(data)
+    except ValueError:
+        return data
+
+    variants = [tga]
+    opaque = _drop_opaque_alpha(tga)
+    if opaque:
+        variants.append(opaque)
+
+    best, best_size = data, len(zlib.compress(data, SIZE_COMPRESSLEVEL))
+    for variant in variants:
+        for rle in (False, True):
+            candidate = encode_tga(variant, rle)
+            size = len(zlib.compress(candidate, SIZE_COMPRESSLEVEL))
+            if size < best_size and read_tga(candidate).pixels == variant.pixels:
+                best, best_size = candidate, size
+    return best
+
+
+def check_texture(path):
+    """
+    Check one texture file.
+
+    Returns:
+        list: Problem descriptions (empty if the texture is fine)
+    """
+    path = Path(path)
+    if path.suffix.lower() != ".tga":
+        return []
+    try:
+        tga = read_tga(path.read_bytes())
+    except (OSError, ValueError) as e:
+        return [f"cannot read TGA: {e}"]
+    problems = []
+    if not (is_power_of_two(tga.width) and is_power_of_two(tga.height)):
+        problems.append(f"dimensions {tga.width}x{tga.height} are not powers of two")
+    return problems
+
+
+def _normalize(path_text):
+    """Lowercase a media path, use '/' separators and drop a media file extension."""
+    parts = [part for part in re.split(r"[\\/]+", path_text.lower()) if part]
+    directory = path_text.endswith(("/", "\\"))
+    if parts and not directory:
+        stem, dot, suffix = parts[-1].rpartition(".")
+        if dot and f".{suffix}" in MEDIA_SUFFIXES:
+            parts[-1] = stem
+    return "/".join(parts) + ("/" if directory else "")
+
+
+def find_media_references(files):
+    """
+    Collect the media paths referenced by Lua, XML and TOC files.
+
+    Args:
+        files: Paths of the addon's files (others are ignored)
+
+    Returns:
+        set: Normalized references, e.g. 'media/icons/icon' or 'media/icons/' for a prefix
+    """
+    references = set()
+    for path in files:
+        path = Path(path)
+        if path.suffix.lower() not in REFERENCE_SUFFIXES:
+            continue
+        text = path.read_text(encoding="utf-8", errors="replace")
+        references.update(_normalize(match) for match in REFERENCE_PATTERN.findall(text))
+    return references
+
+
+def unreferenced_media(relative_paths, references):
+    """
+    Return the media files no reference points at.
+
+    Args:
+        relative_paths: File paths relative to the addon directory ('/' separated)
+        references: Result of find_media_references
+
+    Returns:
+        list: The unreferenced relative paths, in input order
+    """
+    prefixes = tuple(reference for reference in references if reference.endswith("/"))
+    unreferenced = []
+    for relative in relative_paths:
+        if not relative.lower().startswith(f"{MEDIA_DIR}/"):
+            continue
+        key = _normalize(relative)
+        if key not in references and not key.startswith(prefixes):
+            unreferenced.append(relative)
+    return unreferenced
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check addon media and show what packaging would optimize or drop"
+    )
+    parser.add_argument("addon_dir", help="Addon directory (e.g., SpectrumFederation)")
+
+    args = parser.parse_args()
+
+    addon_dir = Path(args.addon_dir)
+    files = sorted(p for p in addon_dir.rglob("*") if p.is_file())
+    relative_paths = [p.relative_to(addon_dir).as_posix() for p in files]
+
+    failed = False
+    for path, relative in zip(files, relative_paths):
+        if path.suffix.lower() != ".tga":
+            continue
+        problems = check_texture(path)
+        for problem in problems:
+            print(f"::error file={path}::{problem}")
+        failed = failed or bool(problems)
+        if not problems:
+            data = path.read_bytes()
+            optimized = optimize_tga(data)
+            before = len(zlib.compress(data, SIZE_COMPRESSLEVEL))
+            after = len(zlib.compress(optimized, SIZE_COMPRESSLEVEL))
+            print(f"[addon-media] {relative}: {before} -> {after} bytes deflated")
+
+    for relative in unreferenced_media(relative_paths, find_media_references(files)):
+        print(f"[addon-media] {relative} is not referenced and will not be packaged")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
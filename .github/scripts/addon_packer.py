@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+"""
+Deterministic zip packer for the addon.
+
+Shared by publish_release.py and validate_packaging.py so release and
+validation archives are built the same way, in-process, without the
+external `zip` binary:
+- entries are written in sorted path order, directories before their contents
+- every entry gets the same timestamp ($SOURCE_DATE_EPOCH, or 1980-01-01)
+- permissions are normalized to 0644 for files and 0755 for directories
+- one exclude list applies everywhere (VCS metadata, editor and OS clutter)
+- members are compressed in parallel, and each is deflated or stored,
+  whichever pays off
+- media is optimized on the way in (see addon_media.py): TGAs are re-encoded
+  losslessly to their smallest form, unreferenced media files are left out
+
+Identical trees therefore produce byte-identical archives (for a given
+zlib version), which makes them cacheable: `cached_addon_zip` keys built
+archives by a hash of the addon tree (the git tree ID when the directory is
+clean, otherwise a hash of the files that would be packed) plus the packer
+settings, and reuses the stored archive on a hit instead of recompressing.
+
+Addons with a TOC per game flavor (`<Addon>_Classic.toc`, ...) get one
+archive per flavor TOC, each leaving out the other flavors' TOCs; all of
+them are built from one scan of the tree, and files shared between them
+are read and compressed only once (`build_addon_zips`).
+
+Each built package also gets a manifest (`<name>.manifest.json`) recording
+the archive's SHA-256, size, source tree hash and entries; publishing
+checks the archive against it, so the released bytes are the validated ones.
+
+Usage:
+    python3 addon_packer.py SpectrumFederation build/SpectrumFederation.zip
+    python3 addon_packer.py SpectrumFederation build/SpectrumFederation.zip --no-cache
+    python3 addon_packer.py SpectrumFederation build/SpectrumFederation.zip --flavors
+"""
+
+import argparse
+import contextlib
+import errno
+import fnmatch
+import functools
+import hashlib
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import addon_media
+from toc_model import addon_packages
+
+
+# Matched against every path component
+DEFAULT_EXCLUDES = (
+    ".git*",
+    ".DS_Store",
+    "Thumbs.db",
+    "desktop.ini",
+    "__pycache__",
+    "*.pyc",
+    "*.swp",
+    "*~",
+    ".vscode",
+    ".idea"
+)
+
+# Earliest timestamp the zip format can store
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+FILE_MODE = 0o100644
+DIR_MODE = 0o040755
+MS_DOS_DIRECTORY = 0x10
+UNIX_SYSTEM = 3
+
+# Zip records (PKWARE APPNOTE 4.3); no ZIP64, the addon is far below 4 GiB
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+END_RECORD = struct.Struct("<IHHHHIIH")
+LOCAL_HEADER_SIGNATURE = 0x04034B50
+CENTRAL_HEADER_SIGNATURE = 0x02014B50
+END_RECORD_SIGNATURE = 0x06054B50
+ZIP_VERSION = 20
+ZIP_STORED = zipfile.ZIP_STORED
+ZIP_DEFLATED = zipfile.ZIP_DEFLATED
+UTF8_FLAG = 0x800
+ZIP_LIMIT = 0xFFFFFFFF
+
+# A member is deflated only if that shrinks it to at most this fraction of its size;
+# already-compressed or noisy data is stored and costs nothing to extract
+DEFLATE_MAX_RATIO = 0.95
+
+# Files at least twice this size are sampled before a full deflate is attempted
+SAMPLE_SIZE = 64 * 1024
+
+# zlib's default level; the best size/time trade-off for textures
+DEFAULT_COMPRESSLEVEL = 6
+
+EMPTY_MEMBER = (ZIP_STORED, 0, 0, b"")
+
+CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_BUILD_CACHE_DIR = os.environ.get("BUILD_CACHE_DIR", ".cache/build")
+
+# Archives kept in the build cache; older ones are pruned after each store
+MAX_CACHED_BUILDS = 20
+
+
+def fixed_date_time():
+    """Return the timestamp for every entry: $SOURCE_DATE_EPOCH (UTC) if set, else 1980-01-01."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return ZIP_EPOCH
+    return max(ZIP_EPOCH, time.gmtime(int(epoch))[:6])
+
+
+def is_excluded(relative_path, excludes=DEFAULT_EXCLUDES):
+    """Return True if any component of a relative path matches an exclude pattern."""
+    return any(
+        fnmatch.fnmatchcase(part, pattern)
+        for part in Path(relative_path).parts
+        for pattern in excludes
+    )
+
+
+def iter_addon_files(source_dir, excludes=DEFAULT_EXCLUDES):
+    """
+    Walk an addon directory in archive order.
+
+    Args:
+        source_dir: Addon directory; it becomes the single top-level folder in the archive
+        excludes: fnmatch patterns matched against every path component
+
+    Yields:
+        tuple: (archive_name, Path, is_dir); directory names end with '/'
+    """
+    source_dir = Path(source_dir)
+    prefix = source_dir.resolve().name
+    yield f"{prefix}/", source_dir, True
+
+    for root, dirs, files in os.walk(source_dir):
+        relative_root = Path(root).relative_to(source_dir)
+        dirs[:] = sorted(d for d in dirs if not is_excluded(relative_root / d, excludes))
+        entries = [(d, True) for d in dirs] + [(f, False) for f in files]
+        for name, is_dir in sorted(entries):
+            relative = relative_root / name
+            if is_excluded(relative, excludes):
+                continue
+            archive_name = f"{prefix}/{relative.as_posix()}" + ("/" if is_dir else "")
+            yield archive_name, Path(root) / name, is_dir
+
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def compress_member(path, compresslevel=DEFAULT_COMPRESSLEVEL, optimize_media=False):
+    """
+    Read, optimize and compress one file, keeping it stored if deflate does not pay off.
+
+    Runs in worker threads; zlib releases the GIL while compressing, so
+    members compress in parallel.
+
+    Args:
+        path: File to compress
+        compresslevel: Deflate level, 0-9 (0 always stores)
+        optimize_media: Re-encode TGA textures with addon_media.optimize_tga
+
+    Returns:
+        tuple: (method, crc32, uncompressed_size, data)
+    """
+    data = Path(path).read_bytes()
+    if optimize_media and Path(path).suffix.lower() == ".tga":
+        data = addon_media.optimize_tga(data)
+    crc = zlib.crc32(data)
+    if compresslevel and data and _worth_deflating(data):
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(data) + compressor.flush()
+        if len(deflated) <= len(data) * DEFLATE_MAX_RATIO:
+            return ZIP_DEFLATED, crc, len(data), deflated
+    return ZIP_STORED, crc, len(data), data
+
+
+def _worth_deflating(data):
+    """Cheaply estimate compressibility of large files from a fast-deflated sample."""
+    if len(data) < 2 * SAMPLE_SIZE:
+        return True
+    middle = len(data) // 2
+    sample = data[:SAMPLE_SIZE // 2] + data[middle:middle + SAMPLE_SIZE // 2]
+    return len(zlib.compress(sample, 1)) <= len(sample) * DEFLATE_MAX_RATIO
+
+
+def prune_media(entries):
+    """
+    Drop unreferenced media files from iter_addon_files entries.
+
+    Directories are dropped too if nothing is left in them.
+
+    Returns:
+        list: The remaining entries, in order
+    """
+    relative_files = {
+        archive_name.split("/", 1)[1]: archive_name
+        for archive_name, _, is_dir in entries if not is_dir
+    }
+    references = addon_media.find_media_references(path for _, path, is_dir in entries if not is_dir)
+    dropped = {relative_files[r] for r in addon_media.unreferenced_media(relative_files, references)}
+    kept_files = [name for name in relative_files.values() if name not in dropped]
+
+    def keep(archive_name, is_dir):
+        if not is_dir:
+            return archive_name not in dropped
+        emptied = any(name.startswith(archive_name) for name in dropped)
+        return not emptied or any(name.startswith(archive_name) for name in kept_files)
+
+    return [entry for entry in entries if keep(entry[0], entry[2])]
+
+
+class _ZipWriter:
+    """
+    Writes one archive member by member to a temporary file, renamed into place by finish().
+
+    Use as a context manager: entering opens the temporary file, and leaving
+    without finish() closes and deletes it, so a failed build never leaves a
+    partial archive.
+    """
+
+    def __init__(self, zip_path, date_time):
+        self.zip_path = Path(zip_path)
+        self.zip_path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.zip_path.with_name(f".{self.zip_path.name}.{os.getpid()}.tmp")
+        self.dos_time, self.dos_date = _dos_date_time(date_time)
+        self.names = []
+        self.central = []
+        self._files = contextlib.ExitStack()
+        self.out = None
+
+    def write_member(self, archive_name, is_dir, member):
+        method, crc, size, data = member
+        name = archive_name.encode("utf-8")
+        flags = 0 if name.isascii() else UTF8_FLAG
+        offset = self.out.tell()
+        if offset > ZIP_LIMIT or len(data) > ZIP_LIMIT or size > ZIP_LIMIT:
+            raise OSError(errno.EFBIG, f"{archive_name} does not fit in a zip without ZIP64")
+        self.out.write(LOCAL_HEADER.pack(
+            LOCAL_HEADER_SIGNATURE, ZIP_VERSION, flags, method, self.dos_time, self.dos_date,
+            crc, len(data), size, len(name), 0
+        ))
+        self.out.write(name)
+        self.out.write(data)
+        external_attr = ((DIR_MODE << 16) | MS_DOS_DIRECTORY) if is_dir else (FILE_MODE << 16)
+        self.central.append(CENTRAL_HEADER.pack(
+            CENTRAL_HEADER_SIGNATURE, (UNIX_SYSTEM << 8) | ZIP_VERSION, ZIP_VERSION, flags, method,
+            self.dos_time, self.dos_date, crc, len(data), size, len(name), 0, 0, 0, 0, external_attr, offset
+        ) + name)
+        self.names.append(archive_name)
+
+    def finish(self):
+        directory_offset = self.out.tell()
+        for record in self.central:
+            self.out.write(record)
+        directory_size = self.out.tell() - directory_offset
+        if len(self.central) > 0xFFFF or directory_offset > ZIP_LIMIT:
+            raise OSError(errno.EFBIG, "archive does not fit in a zip without ZIP64")
+        self.out.write(END_RECORD.pack(
+            END_RECORD_SIGNATURE, 0, 0, len(self.central), len(self.central), directory_size, directory_offset, 0
+        ))
+        self._files.close()
+        os.replace(self.tmp_path, self.zip_path)
+
+    def __enter__(self):
+        with contextlib.ExitStack() as files:
+            self.out = files.enter_context(open(self.tmp_path, "wb"))
+            self._files = files.pop_all()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Discard the archive unless finish() succeeded."""
+        self._files.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+
+def build_addon_zips(source_dir, outputs, excludes=DEFAULT_EXCLUDES, compresslevel=DEFAULT_COMPRESSLEVEL,
+                     workers=None, optimize_media=True):
+    """
+    Build several deterministic zips of one addon directory in a single pass.
+
+    The tree is scanned once and each member is compressed once, in a
+    thread pool, then written to every archive that includes it. Archives
+    differ only in the files they leave out (e.g., other flavors' TOCs),
+    so extra archives cost little more than writing their bytes.
+
+    Args:
+        source_dir: Addon directory (becomes each archive's top-level folder)
+        outputs: {zip_path: files to leave out of that archive, relative to source_dir ('/' separated)}
+        excludes: fnmatch patterns matched against every path component
+        compresslevel: Deflate level, 0-9 (default: 6)
+        workers: Compression threads (default: CPU count)
+        optimize_media: Re-encode textures and leave out unreferenced media (default: True)
+
+    Returns:
+        dict: {zip_path: archive entry names, in archive order}
+
+    Raises:
+        OSError: If a file cannot be read or an archive cannot be written
+    """
+    workers = workers or os.cpu_count() or 1
+    date_time = fixed_date_time()
+    prefix = f"{Path(source_dir).resolve().name}/"
+    omitted = {zip_path: {f"{prefix}{name}" for name in omit} for zip_path, omit in outputs.items()}
+    def write_member(archive_name, is_dir, member):
+        for zip_path, writer in writers.items():
+            if archive_name not in omitted[zip_path]:
+                writer.write_member(archive_name, is_dir, member)
+
+    with contextlib.ExitStack() as stack:
+        writers = {zip_path: stack.enter_context(_ZipWriter(zip_path, date_time)) for zip_path in outputs}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Results are written in submission order; the window bounds how many
+            # compressed members are held in memory at once
+            entries = list(iter_addon_files(source_dir, excludes))
+            if optimize_media:
+                entries = prune_media(entries)
+            pending = deque()
+            for archive_name, path, is_dir in entries:
+                if not is_dir and all(archive_name in omit for omit in omitted.values()):
+                    continue
+                member = EMPTY_MEMBER if is_dir else pool.submit(compress_member, path, compresslevel, optimize_media)
+                pending.append((archive_name, is_dir, member))
+                if len(pending) >= workers * 2:
+                    archive_name, is_dir, member = pending.popleft()
+                    write_member(archive_name, is_dir, member if is_dir else member.result())
+            while pending:
+                archive_name, is_dir, member = pending.popleft()
+                write_member(archive_name, is_dir, member if is_dir else member.result())
+
+        for writer in writers.values():
+            writer.finish()
+
+    return {zip_path: writer.names for zip_path, writer in writers.items()}
+
+
+def build_addon_zip(source_dir, zip_path, excludes=DEFAULT_EXCLUDES, compresslevel=DEFAULT_COMPRESSLEVEL,
+                    workers=None, optimize_media=True):
+    """
+    Build a deterministic zip of an addon directory.
+
+    Members are compressed concurrently in a thread pool, each one either
+    deflated or stored depending on which is smaller (see compress_member),
+    and written in archive order followed by the central directory. The
+    output does not depend on the number of workers.
+
+    The archive is written to a temporary file next to zip_path and renamed
+    into place, so a failed build never leaves a partial archive.
+
+    Args:
+        source_dir: Addon directory (becomes the archive's top-level folder)
+        zip_path: Output archive path
+        excludes: fnmatch patterns matched against every path component
+        compresslevel: Deflate level, 0-9 (default: 6)
+        workers: Compression threads (default: CPU count)
+        optimize_media: Re-encode textures and leave out unreferenced media (default: True)
+
+    Returns:
+        list: Archive entry names, in archive order
+
+    Raises:
+        OSError: If a file cannot be read or the archive cannot be written
+    """
+    outputs = {zip_path: ()}
+    return build_addon_zips(source_dir, outputs, excludes, compresslevel, workers, optimize_media)[zip_path]
+
+
+@functools.cache
+def _source_hash():
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+
+def _git_tree_id(source_dir):
+    """
+    Return the git tree ID of source_dir at HEAD, or None if it does not match the disk.
+
+    The tree ID only describes the directory if nothing in it is modified,
+    untracked or ignored, since the packer would pick those files up too.
+    """
+    def git(*args):
+        return subprocess.run(
+            ["git", "-C", str(source_dir), *args],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+
+    try:
+        if git("status", "--porcelain", "--ignored", "--untracked-files=all", "--", "."):
+            return None
+        return git("rev-parse", "HEAD:./") or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def tree_hash(source_dir, excludes=DEFAULT_EXCLUDES):
+    """
+    Return a content hash of an addon tree.
+
+    Uses the git tree ID when the directory is clean; otherwise hashes the
+    archive names and contents of every file the packer would include.
+
+    Args:
+        source_dir: Addon directory
+        excludes: fnmatch patterns matched against every path component
+
+    Returns:
+        str: 'git:<tree id>' or 'sha256:<hex digest>'
+    """
+    tree_id = _git_tree_id(source_dir)
+    if tree_id:
+        return f"git:{tree_id}"
+
+    digest = hashlib.sha256()
+    for archive_name, path, is_dir in iter_addon_files(source_dir, excludes):
+        digest.update(archive_name.encode("utf-8") + b"\0")
+        if not is_dir:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+    return f"sha256:{digest.hexdigest()}"
+
+
+def build_key(source_dir, excludes=DEFAULT_EXCLUDES, compresslevel=DEFAULT_COMPRESSLEVEL, optimize_media=True):
+    """Return the build cache key: tree hash plus everything else that shapes the archive."""
+    parts = [
+        tree_hash(source_dir, excludes),
+        Path(source_dir).resolve().name,
+        "\0".join(excludes),
+        repr(fixed_date_time()),
+        str(compresslevel),
+        _source_hash(),
+        f"media:{addon_media.source_hash()}" if optimize_media else "media:off"
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def place_file(src, dst, link=False):
+    """
+    Place a copy of src at dst atomically.
+
+    With link=True, hard-links instead when possible; only do that when
+    neither file is written to afterwards, since they share their content.
+    """
+    dst = Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        linked = False
+        if link:
+            try:
+                os.link(src, tmp_path)
+                linked = True
+            except OSError:
+                pass  # e.g., different filesystems
+        if not linked:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _prune_cache(cache_dir, keep=MAX_CACHED_BUILDS):
+    entries = sorted(Path(cache_dir).glob("*.zip"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in entries[keep:]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+
+def _output_key(base_key, omit):
+    """Cache key of one archive of a tree: the build key, plus the files it leaves out."""
+    if not omit:
+        return base_key
+    return hashlib.sha256("\n".join([base_key, *sorted(omit)]).encode("utf-8")).hexdigest()
+
+
+def cached_addon_zips(source_dir, outputs, cache_dir=DEFAULT_BUILD_CACHE_DIR,
+                      excludes=DEFAULT_EXCLUDES, compresslevel=DEFAULT_COMPRESSLEVEL, workers=None,
+                      optimize_media=True):
+    """
+    Build several archives of an addon (see build_addon_zips), reusing cached ones of the same tree.
+
+    Archives missing from the cache are built together in one pass and
+    copied into the cache; cache entries are never shared with outputs, so
+    writing to an output cannot corrupt the cache. Cache write failures
+    only print a warning.
+
+    Args:
+        source_dir: Addon directory (becomes each archive's top-level folder)
+        outputs: {zip_path: files to leave out of that archive, relative to source_dir}
+        cache_dir: Build cache directory (None to always build)
+        excludes: fnmatch patterns matched against every path component
+        compresslevel: Deflate level, 0-9 (default: 6)
+        workers: Compression threads on a miss (default: CPU count)
+        optimize_media: Re-encode textures and leave out unreferenced media (default: True)
+
+    Returns:
+        dict: {zip_path: (entry_names, cache_hit)}
+
+    Raises:
+        OSError: If a file cannot be read or an archive cannot be written
+    """
+    if cache_dir is None:
+        built = build_addon_zips(source_dir, outputs, excludes, compresslevel, workers, optimize_media)
+        return {zip_path: (names, False) for zip_path, names in built.items()}
+
+    base_key = build_key(source_dir, excludes, compresslevel, optimize_media)
+    results = {}
+    missing = {}
+    for zip_path, omit in outputs.items():
+        cached = Path(cache_dir) / f"{_output_key(base_key, omit)}.zip"
+        if cached.is_file():
+            try:
+                with zipfile.ZipFile(cached) as zf:
+                    names = zf.namelist()
+                place_file(cached, zip_path)
+                os.utime(cached)  # Keep recently used entries from being pruned
+                results[zip_path] = (names, True)
+                continue
+            except (OSError, zipfile.BadZipFile) as e:
+                print(f"[addon-packer] Warning: Ignoring unreadable cache entry {cached}: {e}", file=sys.stderr)
+        missing[zip_path] = cached
+
+    if missing:
+        built = build_addon_zips(source_dir, {zip_path: outputs[zip_path] for zip_path in missing},
+                                 excludes, compresslevel, workers, optimize_media)
+        for zip_path, cached in missing.items():
+            results[zip_path] = (built[zip_path], False)
+            try:
+                place_file(zip_path, cached)
+            except OSError as e:
+                print(f"[addon-packer] Warning: Could not store build in cache: {e}", file=sys.stderr)
+        try:
+            _prune_cache(cache_dir)
+        except OSError as e:
+            print(f"[addon-packer] Warning: Could not prune build cache: {e}", file=sys.stderr)
+    return {zip_path: results[zip_path] for zip_path in outputs}
+
+
+def cached_addon_zip(source_dir, zip_path, cache_dir=DEFAULT_BUILD_CACHE_DIR,
+                     excludes=DEFAULT_EXCLUDES, compresslevel=DEFAULT_COMPRESSLEVEL, workers=None,
+                     optimize_media=True):
+    """
+    Build an addon zip, reusing a cached archive of the same tree if there is one.
+
+    Returns:
+        tuple: (entry_names, cache_hit)
+
+    Raises:
+        OSError: If a file cannot be read or the archive cannot be written
+    """
+    outputs = {zip_path: ()}
+    return cached_addon_zips(source_dir, outputs, cache_dir, excludes, compresslevel, workers,
+                             optimize_media)[zip_path]
+
+
+def package_zip_path(zip_path, package):
+    """Return a package's archive path: build/Addon.zip -> build/Addon-classic.zip (unchanged for suffix "")."""
+    zip_path = Path(zip_path)
+    if not package.suffix:
+        return zip_path
+    return zip_path.with_name(f"{zip_path.stem}-{package.suffix}{zip_path.suffix}")
+
+
+def package_outputs(zip_path, packages):
+    """
+    Map each package's archive path to the files it leaves out: the other packages' TOCs.
+
+    Args:
+        zip_path: Archive path of the unsuffixed package (see package_zip_path)
+        packages: Result of toc_model.addon_packages
+
+    Returns:
+        dict: {archive path: TOC file names to leave out}, in package order
+    """
+    toc_names = [Path(package.toc.path).name for package in packages]
+    return {
+        package_zip_path(zip_path, package): tuple(name for name in toc_names if name != own)
+        for package, own in zip(packages, toc_names)
+    }
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path_for(zip_path):
+    """Return the manifest path belonging to an archive (build/X.zip -> build/X.manifest.json)."""
+    zip_path = Path(zip_path)
+    return zip_path.with_name(f"{zip_path.stem}.manifest.json")
+
+
+def write_manifest(zip_path, source_dir, **fields):
+    """
+    Write the manifest of a built archive next to it.
+
+    Args:
+        zip_path: Built archive
+        source_dir: Addon directory the archive was built from
+        **fields: Extra top-level fields (e.g., validated=True)
+
+    Returns:
+        dict: The manifest that was written
+    """
+    zip_path = Path(zip_path)
+    with zipfile.ZipFile(zip_path) as zf:
+        entries = [
+            {"name": info.filename, "size": info.file_size, "crc": f"{info.CRC:08x}"}
+            for info in zf.infolist()
+        ]
+    manifest = {
+        "archive": zip_path.name,
+        "sha256": file_sha256(zip_path),
+        "size": zip_path.stat().st_size,
+        "tree": tree_hash(source_dir),
+        **fields,
+        "entries": entries
+    }
+    with open(manifest_path_for(zip_path), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def verify_artifact(zip_path, manifest_path=None):
+    """
+    Check that an archive is byte-for-byte the one its manifest describes.
+
+    Args:
+        zip_path: Archive to check
+        manifest_path: Manifest (default: manifest_path_for(zip_path))
+
+    Returns:
+        dict: The manifest
+
+    Raises:
+        OSError: If the archive or manifest cannot be read
+        ValueError: If the manifest is invalid or does not match the archive
+    """
+    zip_path = Path(zip_path)
+    manifest_path = manifest_path or manifest_path_for(zip_path)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, dict) or "sha256" not in manifest:
+        raise ValueError(f"{manifest_path} is not a package manifest")
+
+    size = zip_path.stat().st_size
+    if size != manifest.get("size"):
+        raise ValueError(f"{zip_path} is {size} bytes, manifest says {manifest.get('size')}")
+    digest = file_sha256(zip_path)
+    if digest != manifest["sha256"]:
+        raise ValueError(f"{zip_path} has SHA-256 {digest}, manifest says {manifest['sha256']}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a deterministic zip of an addon directory"
+    )
+    parser.add_argument("source_dir", help="Addon directory (e.g., SpectrumFederation)")
+    parser.add_argument("zip_path", help="Output zip file")
+    parser.add_argument("--exclude", action="append", default=[],
+                        help="Extra fnmatch pattern to exclude (repeatable)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Compression threads (default: CPU count)")
+    parser.add_argument("--no-optimize-media", action="store_true",
+                        help="Package media exactly as committed")
+    parser.add_argument("--cache-dir", default=DEFAULT_BUILD_CACHE_DIR,
+                        help=f"Build cache directory (default: {DEFAULT_BUILD_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always rebuild the archive")
+    parser.add_argument("--flavors", action="store_true",
+                        help="Build one archive per flavor TOC (e.g., build/Addon-classic.zip next to zip_path)")
+
+    args = parser.parse_args()
+
+    if not Path(args.source_dir).is_dir():
+        print(f"::error ::Addon directory '{args.source_dir}' not found")
+        return 1
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    try:
+        outputs = {args.zip_path: ()}
+        if args.flavors:
+            outputs = package_outputs(args.zip_path, addon_packages(args.source_dir))
+        results = cached_addon_zips(args.source_dir, outputs, cache_dir,
+                                    DEFAULT_EXCLUDES + tuple(args.exclude), workers=args.jobs,
+                                    optimize_media=not args.no_optimize_media)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"::error ::Failed to create zip: {e}")
+        return 1
+
+    for zip_path, (names, hit) in results.items():
+        source = " (reused cached build)" if hit else ""
+        print(f"[addon-packer] ✓ Wrote {len(names)} entries to {zip_path}{source}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
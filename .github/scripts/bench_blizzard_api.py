@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark blizzard_api against the local fake patch server.
+
+Measures, without network access:
+- Parse throughput of TACT `versions` manifests at several payload sizes
+- End-to-end latency of batch queries over HTTP and Ribbit (cold and warm cache)
+
+Usage:
+    python3 bench_blizzard_api.py
+    python3 bench_blizzard_api.py --json > bench-baseline.json
+    python3 bench_blizzard_api.py --baseline bench-baseline.json --tolerance 0.25
+
+With --baseline, exits non-zero when any metric regressed by more than the
+tolerance (throughput dropped, or latency rose, by that fraction).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+import blizzard_api
+from blizzard_cache import ResponseCache
+from blizzard_manifest import parse_manifest
+from fake_patch_server import FakePatchServer, build_versions_payload, default_payloads
+
+
+PARSE_SIZES = (0, 64 * 1024, 1024 * 1024)
+
+
+def _time_repeated(func, min_time):
+    """Call func until min_time seconds have passed; return seconds per call."""
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time or calls < 3:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / calls
+
+
+def bench_parse(min_time):
+    """Return parse throughput metrics for each payload size."""
+    metrics = {}
+    for size in PARSE_SIZES:
+        body = build_versions_payload("wow", "11.2.7.64978", 3263340, size)
+        rows = body.count(b"\n") - 2
+        label = f"{len(body) // 1024}k" if len(body) >= 1024 else f"{len(body)}b"
+
+        per_call = _time_repeated(lambda: parse_manifest(body).index_by("Region"), min_time)
+        metrics[f"parse_full_{label}_mb_per_s"] = (len(body) / per_call / 1e6, "higher")
+        metrics[f"parse_full_{label}_rows_per_s"] = (rows / per_call, "higher")
+
+        per_call = _time_repeated(lambda: blizzard_api.parse_version_response(body, "us"), min_time)
+        metrics[f"lookup_us_{label}_us"] = (per_call * 1e6, "lower")
+    return metrics
+
+
+def _latencies(func, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_end_to_end(latency, rounds, payload_size):
+    """Return batch query latency metrics against a local fake server."""
+    metrics = {}
+    products = list(blizzard_api.PRODUCTS)
+    policy = blizzard_api.RequestPolicy(retries=0, hedge_hosts=())
+
+    with FakePatchServer(default_payloads(payload_size), latency=latency, seed=1) as server:
+        def query(transport, port, cache=None):
+            results = blizzard_api.get_game_versions(products, ["us", "eu"], cache=cache, transport=transport,
+                                                     policy=policy, host=server.host, port=port)
+            errors = [r for r in results if r.error]
+            if errors:
+                raise RuntimeError(f"Benchmark query failed: {errors[0].error}")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            scenarios = {
+                "http_cold": lambda: query("http", server.http_port),
+                "http_revalidate": lambda: query("http", server.http_port, ResponseCache(cache_dir)),
+                "ribbit_cold": lambda: query("ribbit", server.ribbit_port),
+                "ribbit_seqn_unchanged": lambda: query("ribbit", server.ribbit_port, ResponseCache(cache_dir)),
+            }
+            # Warm the shared cache so the revalidation scenarios measure steady state
+            scenarios["http_revalidate"]()
+            scenarios["ribbit_seqn_unchanged"]()
+
+            for name, func in scenarios.items():
+                samples = _latencies(func, rounds)
+                metrics[f"e2e_{name}_p50_ms"] = (statistics.median(samples), "lower")
+                metrics[f"e2e_{name}_max_ms"] = (max(samples), "lower")
+
+    return metrics
+
+
+def compare_to_baseline(metrics, baseline, tolerance):
+    """Return a list of regression messages for metrics worse than baseline by more than tolerance."""
+    regressions = []
+    for name, (value, better) in metrics.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]["value"]
+        if not reference:
+            continue
+        change = (value - reference) / reference
+        if (better == "higher" and change < -tolerance) or (better == "lower" and change > tolerance):
+            regressions.append(f"{name}: {value:.2f} vs baseline {reference:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark blizzard_api parsing and fetch latency offline"
+    )
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Fake server response delay in seconds (default: 0.02)")
+    parser.add_argument("--rounds", type=int, default=5, help="End-to-end rounds per scenario (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per parse benchmark (default: 0.2)")
+    parser.add_argument("--payload-size", type=int, default=0,
+                        help="Pad served versions files to this many bytes (default: 0)")
+    parser.add_argument("--skip-e2e", action="store_true", help="Only run the parse benchmarks")
+    parser.add_argument("--json", action="store_true", help="Print metrics as JSON (usable as a baseline)")
+    parser.add_argument("--baseline", help="JSON file from a previous --json run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed regression fraction versus baseline (default: 0.25)")
+
+    args = parser.parse_args()
+
+    print("[bench-blizzard-api] Running benchmarks...", file=sys.stderr)
+
+    # blizzard_api logs every request to stderr; keep benchmark output readable
+    with contextlib.redirect_stderr(io.StringIO()):
+        metrics = bench_parse(args.min_time)
+        if not args.skip_e2e:
+            metrics.update(bench_end_to_end(args.latency, args.rounds, args.payload_size))
+
+    if args.json:
+        print(json.dumps({name: {"value": value, "better": better} for name, (value, better) in metrics.items()},
+                         indent=2))
+    else:
+        for name, (value, better) in metrics.items():
+            print(f"{name:45} {value:14.2f}  ({better} is better)")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(metrics, baseline, args.tolerance)
+        if regressions:
+            print("[bench-blizzard-api] ✗ Regressions detected:", file=sys.stderr)
+            for message in regressions:
+                print(f"  {message}", file=sys.stderr)
+            return 1
+        print("[bench-blizzard-api] ✓ No regressions versus baseline", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
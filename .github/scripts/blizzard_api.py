@@ -4,13 +4,50 @@ Blizzard API client for querying WoW game versions.
 
 Retrieves current Interface version from Blizzard's patch server.
 No authentication required - endpoints are publicly accessible.
+
+Single environment:
+    python3 blizzard_api.py --environment beta --output interface
+
+Batch mode (all products, several regions, one process):
+    python3 blizzard_api.py --products all --regions us,eu,kr,tw
+
+Multi-flavor TOC Interface (one process, one parallel fetch):
+    python3 blizzard_api.py --products wow,wow_classic,wow_classic_era --format interface
+    python3 blizzard_api.py --products wow,wow_classic --write-toc
+
+Watch for build changes (JSON line per change, optional hook command):
+    python3 blizzard_api.py --watch --products wow,wow_beta --on-change ./notify.sh
+
+Native Ribbit transport (only downloads products whose seqn changed):
+    python3 blizzard_api.py --products all --transport ribbit
+
+Slow or failing patch servers are retried with jittered exponential backoff,
+and hedged to the eu/kr hosts when the first answer is late:
+    python3 blizzard_api.py --environment live --hedge-delay 1.0 --latency-report
+
+Caching (reuse responses between CI jobs, survive a slow patch server):
+    python3 blizzard_api.py --environment beta --max-age 300
+    python3 blizzard_api.py --environment beta --offline
 """
 
 import argparse
+import http.client
+import json
+import queue
+import random
 import re
 import sys
-import urllib.request
-import urllib.error
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from blizzard_cache import DEFAULT_CACHE_DIR, ResponseCache
+from blizzard_history import DEFAULT_HISTORY_PATH, VersionHistory
+from blizzard_manifest import ManifestError, parse_manifest
+from blizzard_ribbit import RIBBIT_HOST, RIBBIT_PORT, RibbitClient, RibbitError
+from blizzard_watch import AdaptivePoller, parse_patch_days, parse_patch_hours, watch
 
 
 ENDPOINTS = {
@@ -18,8 +55,327 @@ ENDPOINTS = {
     "beta": "http://us.patch.battle.net:1119/wow_beta/versions"
 }
 
+ENVIRONMENT_PRODUCTS = {
+    "live": "wow",
+    "beta": "wow_beta"
+}
+
+# Known WoW product codes on the patch server
+PRODUCTS = {
+    "wow": "Retail",
+    "wow_beta": "Retail Beta",
+    "wowt": "Retail PTR",
+    "wowxptr": "Retail Experimental PTR",
+    "wow_classic": "Classic",
+    "wow_classic_beta": "Classic Beta",
+    "wow_classic_ptr": "Classic PTR",
+    "wow_classic_era": "Classic Era",
+    "wow_classic_era_ptr": "Classic Era PTR"
+}
+
+REGIONS = ("us", "eu", "kr", "tw")
+
+TRANSPORTS = ("http", "ribbit")
+
+PATCH_HOST = "us.patch.battle.net"
+PATCH_PORT = 1119
+DEFAULT_TIMEOUT = 10
+
+DEFAULT_TOC_PATH = "SpectrumFederation/SpectrumFederation.toc"
+
+INTERFACE_LINE_PATTERN = re.compile(r"^## Interface:[^\r\n]*", re.MULTILINE)
 
-def parse_version_response(response_text):
+# Alternate hosts raced against PATCH_HOST when it answers slowly
+HEDGE_HOSTS = ("eu.patch.battle.net", "kr.patch.battle.net")
+
+# Attempts kept for --latency-report; bounded so long --watch runs do not grow without limit
+MAX_RECORDED_ATTEMPTS = 1000
+
+VERSION_PATTERN = re.compile(r'^\d+\.\d+\.\d+\.\d+$')
+
+VersionResult = namedtuple(
+    "VersionResult",
+    ["product", "region", "version", "interface", "build", "seqn", "error"]
+)
+
+Attempt = namedtuple("Attempt", ["host", "try_number", "latency_ms", "outcome"])
+
+
+class BlizzardAPIError(Exception):
+    """
+    Raised when the patch server cannot be reached or returns an error.
+    
+    `retryable` is True for failures worth retrying (connection errors,
+    timeouts, HTTP 5xx/429) and False for definitive answers such as 404.
+    """
+    
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class RequestPolicy:
+    """
+    Retry and hedging settings for patch server requests.
+    
+    Each try races the primary host against HEDGE_HOSTS: the next host is
+    started whenever the previous ones have been silent for `hedge_delay`
+    seconds (or failed), and the first successful answer wins. Failed tries
+    are retried after a full-jitter exponential backoff. The most recent
+    MAX_RECORDED_ATTEMPTS requests are kept in `attempts` for latency reporting.
+    """
+    
+    def __init__(self, retries=2, backoff=0.5, max_backoff=8.0, hedge_delay=1.5, hedge_hosts=HEDGE_HOSTS):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_delay = hedge_delay
+        self.hedge_hosts = tuple(hedge_hosts)
+        self.attempts = deque(maxlen=MAX_RECORDED_ATTEMPTS)
+        self._lock = threading.Lock()
+    
+    def hosts_for(self, host):
+        """Return the primary host followed by the distinct hedge hosts."""
+        return [host] + [h for h in self.hedge_hosts if h != host]
+    
+    def backoff_delay(self, retry):
+        """Full-jitter backoff: uniform in [0, min(max_backoff, backoff * 2^retry)]."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** retry)))
+    
+    def record(self, attempt):
+        # Written as one call under the lock so concurrent workers never interleave lines
+        with self._lock:
+            self.attempts.append(attempt)
+            sys.stderr.write(f"[blizzard-api] Try {attempt.try_number} {attempt.host}: {attempt.outcome} "
+                             f"in {attempt.latency_ms:.0f} ms\n")
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP connections.
+    
+    Idle connections are kept per (host, port) and reused by whichever
+    worker asks next, so a batch of requests to the same patch server
+    pays for the TCP handshake once per worker instead of once per request.
+    """
+    
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+    
+    def _acquire(self, host, port):
+        with self._lock:
+            idle = self._idle.get((host, port))
+            if idle:
+                return idle.pop(), True
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+    
+    def _release(self, host, port, conn):
+        with self._lock:
+            self._idle.setdefault((host, port), []).append(conn)
+    
+    def request(self, host, port, path, headers=None):
+        """
+        Send a GET request over a pooled connection.
+        
+        Returns:
+            tuple: (status, headers_dict, body_bytes)
+        
+        Raises:
+            BlizzardAPIError: On connection failure
+        """
+        conn, reused = self._acquire(host, port)
+        try:
+            conn.request("GET", path, headers=headers or {})
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            if reused:
+                # The server may have dropped an idle keep-alive connection;
+                # retry once on a fresh one before giving up
+                return self.request(host, port, path, headers)
+            raise BlizzardAPIError(f"Failed to reach {host}:{port}: {e}", retryable=True) from e
+        
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(host, port, conn)
+        
+        return response.status, {k.lower(): v for k, v in response.getheaders()}, body
+    
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def product_path(product, file_name="versions"):
+    """Return the patch server path for a product file (e.g., /wow/versions)."""
+    return f"/{product}/{file_name}"
+
+
+def _race_hosts(pool, hosts, port, path, headers, policy, try_number):
+    """
+    Send the request to hosts one hedge_delay apart; return the first success.
+    
+    Only retryable errors fail over to the next host; a non-retryable one
+    (e.g. a 404) is raised as soon as it arrives. Requests run on daemon
+    threads so a hung loser never delays process exit.
+    """
+    results = queue.Queue()
+    
+    def attempt(host):
+        start = time.monotonic()
+        try:
+            status, response_headers, body = pool.request(host, port, path, headers)
+        except BlizzardAPIError as e:
+            policy.record(Attempt(host, try_number, (time.monotonic() - start) * 1000, str(e)))
+            results.put(e)
+            return
+        policy.record(Attempt(host, try_number, (time.monotonic() - start) * 1000, f"HTTP {status}"))
+        if status in (200, 304):
+            results.put((status, response_headers, body))
+        else:
+            results.put(BlizzardAPIError(f"HTTP {status} when querying {host}{path}",
+                                         retryable=status >= 500 or status == 429))
+    
+    def launch(host):
+        threading.Thread(target=attempt, args=(host,), daemon=True).start()
+    
+    errors = []
+    launched = finished = 0
+    launch(hosts[0])
+    launched += 1
+    
+    while finished < launched:
+        try:
+            result = results.get(timeout=policy.hedge_delay if launched < len(hosts) else None)
+        except queue.Empty:
+            # Primary is slow: hedge to the next host without cancelling it
+            launch(hosts[launched])
+            launched += 1
+            continue
+        
+        finished += 1
+        if not isinstance(result, BlizzardAPIError):
+            return result
+        if not result.retryable:
+            raise result
+        errors.append(result)
+        if launched < len(hosts):
+            launch(hosts[launched])
+            launched += 1
+    
+    raise BlizzardAPIError("; ".join(str(e) for e in errors), retryable=True)
+
+
+def resilient_request(pool, host, port, path, headers=None, policy=None):
+    """
+    GET a path with hedging across regional hosts and jittered retries.
+    
+    Args:
+        pool: ConnectionPool to send requests through
+        host: Primary patch server host
+        port: Patch server port
+        path: Request path (e.g., /wow/versions)
+        headers: Optional extra request headers
+        policy: RequestPolicy (default: RequestPolicy())
+    
+    Returns:
+        tuple: (status, headers_dict, body_bytes) with status 200 or 304
+    
+    Raises:
+        BlizzardAPIError: When every try fails, or on a non-retryable error
+    """
+    policy = policy or RequestPolicy()
+    hosts = policy.hosts_for(host)
+    
+    for retry in range(policy.retries + 1):
+        if retry:
+            delay = policy.backoff_delay(retry - 1)
+            print(f"[blizzard-api] Retrying {path} in {delay:.2f}s", file=sys.stderr)
+            time.sleep(delay)
+        try:
+            return _race_hosts(pool, hosts, port, path, headers, policy, retry + 1)
+        except BlizzardAPIError as e:
+            if not e.retryable or retry == policy.retries:
+                raise
+
+
+def fetch_product_file(product, pool, file_name="versions", host=PATCH_HOST, port=PATCH_PORT, cache=None,
+                       policy=None):
+    """
+    Download a raw product file (`versions`, `cdns` or `bgdl`).
+    
+    Args:
+        product: Product code (e.g., "wow_beta")
+        pool: ConnectionPool to send the request through
+        file_name: Which product file to download (default: versions)
+        host: Patch server host
+        port: Patch server port
+        cache: Optional ResponseCache consulted before the network
+        policy: Optional RequestPolicy for retries and hedging
+    
+    Returns:
+        Response body as bytes
+    
+    Raises:
+        BlizzardAPIError: On HTTP or connection errors (with no usable cache entry)
+    """
+    path = product_path(product, file_name)
+    
+    def request(headers=None):
+        return resilient_request(pool, host, port, path, headers, policy)
+    
+    if cache is None:
+        return request()[2]
+    
+    try:
+        return cache.fetch(f"http://{host}:{port}{path}", request)
+    except LookupError as e:
+        raise BlizzardAPIError(str(e)) from e
+
+
+def fetch_product_versions(product, pool, host=PATCH_HOST, port=PATCH_PORT, cache=None, policy=None):
+    """Download the raw `versions` manifest for one product as text."""
+    return fetch_product_file(product, pool, "versions", host, port, cache, policy).decode('utf-8')
+
+
+def fetch_manifest(product, pool, file_name="versions", host=PATCH_HOST, port=PATCH_PORT, cache=None,
+                   policy=None):
+    """
+    Download and parse a product file into a Manifest.
+    
+    Raises:
+        BlizzardAPIError: On HTTP/connection errors or an unparseable body
+    """
+    body = fetch_product_file(product, pool, file_name, host, port, cache, policy)
+    try:
+        return parse_manifest(body)
+    except ManifestError as e:
+        raise BlizzardAPIError(f"Invalid {file_name} manifest for {product}: {e}") from e
+
+
+def version_from_record(record):
+    """Return the VersionsName of a `versions` record if it looks like a game version."""
+    version = getattr(record, "VersionsName", None)
+    if version and VERSION_PATTERN.match(version):
+        return version
+    return None
+
+
+def parse_version_response(response_text, region="us"):
     """
     Parse Blizzard's version response.
     
@@ -27,24 +383,25 @@ def parse_version_response(response_text):
         Region!STRING:0|BuildConfig!HEX:16|...
         us|hash|hash|hash|64978|11.2.7.64978|hash
     
+    Columns are located through the header, so the VersionsName column is
+    found by name rather than by position.
+    
+    Args:
+        response_text: Raw body of a `versions` file (text or bytes)
+        region: Region row to read (default: us)
+    
     Returns:
         Version string (e.g., "11.2.7.64978") or None
     """
-    lines = response_text.strip().split('\n')
-    
-    # Find the 'us' region line
-    for line in lines:
-        if line.startswith('us|'):
-            parts = line.split('|')
-            # Version is typically in format: Major.Minor.Patch.Build
-            # Usually in the 6th column (index 5)
-            if len(parts) >= 6:
-                version_candidate = parts[5]
-                # Validate it looks like a version
-                if re.match(r'^\d+\.\d+\.\d+\.\d+$', version_candidate):
-                    return version_candidate
+    try:
+        manifest = parse_manifest(response_text)
+        record = manifest.find("Region", region)
+    except (ManifestError, KeyError):
+        return None
     
-    return None
+    if record is None:
+        return None
+    return version_from_record(record)
 
 
 def version_to_interface(version):
@@ -74,12 +431,19 @@ def version_to_interface(version):
         return None
 
 
-def get_game_version(environment="live"):
+def get_game_version(environment="live", cache=None, transport="http", policy=None, timeout=DEFAULT_TIMEOUT,
+                     host=None, port=None):
     """
     Query Blizzard API for current game version.
     
     Args:
         environment: "live" or "beta"
+        cache: Optional ResponseCache for the versions file
+        transport: "http" or "ribbit"
+        policy: Optional RequestPolicy for HTTP retries and hedging
+        timeout: Per-request socket timeout in seconds
+        host: Server host override
+        port: Server port override
     
     Returns:
         tuple: (version_string, interface_version) or (None, None) on error
@@ -88,15 +452,25 @@ def get_game_version(environment="live"):
         print(f"Error: Invalid environment '{environment}'. Use 'live' or 'beta'", file=sys.stderr)
         return None, None
     
-    url = ENDPOINTS[environment]
+    product = ENVIRONMENT_PRODUCTS[environment]
+    
+    if transport == "ribbit":
+        url = RibbitClient(host or RIBBIT_HOST, port or RIBBIT_PORT).cache_key(product)
+    elif host or port:
+        url = f"http://{host or PATCH_HOST}:{port or PATCH_PORT}{product_path(product)}"
+    else:
+        url = ENDPOINTS[environment]
     
     print(f"[blizzard-api] Querying {environment} endpoint: {url}", file=sys.stderr)
     
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = response.read().decode('utf-8')
-            
-        version = parse_version_response(data)
+        manifest = fetch_manifests([product], transport=transport, timeout=timeout, cache=cache,
+                                   policy=policy, host=host, port=port)[product]
+        if isinstance(manifest, BlizzardAPIError):
+            raise manifest
+        
+        record = manifest.find("Region", "us")
+        version = version_from_record(record) if record else None
         
         if not version:
             print("Error: Could not parse version from Blizzard API response", file=sys.stderr)
@@ -113,17 +487,232 @@ def get_game_version(environment="live"):
         
         return version, interface
         
-    except urllib.error.HTTPError as e:
-        print(f"Error: HTTP {e.code} {e.reason} when querying Blizzard API", file=sys.stderr)
-        return None, None
-    except urllib.error.URLError as e:
-        print(f"Error: Failed to reach Blizzard API: {e.reason}", file=sys.stderr)
+    except (BlizzardAPIError, ManifestError) as e:
+        print(f"Error: {e}", file=sys.stderr)
         return None, None
     except Exception as e:
         print(f"Error: Unexpected error querying Blizzard API: {e}", file=sys.stderr)
         return None, None
 
 
+def fetch_manifests(products, transport="http", max_workers=8, timeout=DEFAULT_TIMEOUT, cache=None,
+                    policy=None, host=None, port=None, pool=None):
+    """
+    Fetch and parse the `versions` manifest of several products concurrently.
+    
+    Args:
+        products: Iterable of product codes
+        transport: "http" (pooled keep-alive connections) or "ribbit"
+            (summary seqn check, then only changed products are downloaded)
+        max_workers: Maximum number of concurrent requests
+        timeout: Per-request socket timeout in seconds
+        cache: Optional ResponseCache shared by all workers
+        policy: Optional RequestPolicy for HTTP retries and hedging
+        host: Server host override (default: PATCH_HOST or RIBBIT_HOST)
+        port: Server port override (default: PATCH_PORT or RIBBIT_PORT)
+        pool: Optional caller-owned ConnectionPool to keep connections open
+            across calls (HTTP only; a temporary pool is used otherwise)
+    
+    Returns:
+        dict: {product: Manifest or BlizzardAPIError}
+    """
+    products = list(dict.fromkeys(products))
+    
+    if transport == "ribbit":
+        client = RibbitClient(host or RIBBIT_HOST, port or RIBBIT_PORT, timeout=timeout)
+        manifests = {}
+        for product, (body, _) in client.fetch_changed(products, cache=cache, max_workers=max_workers).items():
+            if isinstance(body, RibbitError):
+                manifests[product] = BlizzardAPIError(str(body))
+                continue
+            try:
+                manifests[product] = parse_manifest(body)
+            except ManifestError as e:
+                manifests[product] = BlizzardAPIError(f"Invalid versions manifest for {product}: {e}")
+        return manifests
+    
+    if transport != "http":
+        raise ValueError(f"Unknown transport '{transport}'. Use one of: {', '.join(TRANSPORTS)}")
+    
+    if pool is None:
+        with ConnectionPool(timeout=timeout) as owned_pool:
+            return fetch_manifests(products, transport=transport, max_workers=max_workers, timeout=timeout,
+                                   cache=cache, policy=policy, host=host, port=port, pool=owned_pool)
+    
+    def fetch(product):
+        try:
+            return fetch_manifest(product, pool, host=host or PATCH_HOST, port=port or PATCH_PORT,
+                                  cache=cache, policy=policy)
+        except BlizzardAPIError as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(products)))) as executor:
+        return dict(zip(products, executor.map(fetch, products)))
+
+
+def _results_from_manifest(product, regions, manifest):
+    """Build one result row per region from a product's versions manifest."""
+    if isinstance(manifest, BlizzardAPIError):
+        return [VersionResult(product, region, None, None, None, None, str(manifest)) for region in regions]
+    
+    try:
+        records = manifest.index_by("Region")
+    except KeyError as e:
+        return [VersionResult(product, region, None, None, None, manifest.seqn, f"missing column {e}")
+                for region in regions]
+    except ManifestError as e:
+        return [VersionResult(product, region, None, None, None, manifest.seqn, str(e))
+                for region in regions]
+    
+    results = []
+    for region in regions:
+        record = records.get(region)
+        version = version_from_record(record) if record else None
+        if not version:
+            results.append(VersionResult(product, region, None, None, None, manifest.seqn,
+                                         "no version row for region"))
+            continue
+        interface = version_to_interface(version)
+        error = None if interface else f"cannot convert '{version}' to Interface format"
+        results.append(VersionResult(product, region, version, interface,
+                                     getattr(record, "BuildId", None), manifest.seqn, error))
+    return results
+
+
+def get_game_versions(products, regions=("us",), max_workers=8, timeout=DEFAULT_TIMEOUT, cache=None,
+                      transport="http", policy=None, host=None, port=None, pool=None):
+    """
+    Query several products concurrently.
+    
+    Each product's `versions` file already lists every region, so one request
+    per product covers all requested regions.
+    
+    Args:
+        products: Iterable of product codes (e.g., ["wow", "wow_beta"])
+        regions: Iterable of region codes (e.g., ["us", "eu"])
+        max_workers: Maximum number of concurrent requests
+        timeout: Per-request socket timeout in seconds
+        cache: Optional ResponseCache shared by all workers
+        transport: "http" or "ribbit"
+        policy: Optional RequestPolicy for HTTP retries and hedging
+        host: Server host override
+        port: Server port override
+        pool: Optional caller-owned ConnectionPool (HTTP only)
+    
+    Returns:
+        list[VersionResult]: One row per (product, region), in input order
+    """
+    products = list(dict.fromkeys(products))
+    regions = list(dict.fromkeys(regions))
+    
+    print(f"[blizzard-api] Querying {len(products)} product(s) for region(s) {', '.join(regions)} "
+          f"over {transport}", file=sys.stderr)
+    
+    manifests = fetch_manifests(products, transport, max_workers, timeout, cache, policy, host, port, pool)
+    return [row for product in products for row in _results_from_manifest(product, regions, manifests[product])]
+
+
+def interfaces_from_results(results):
+    """
+    Return the deduplicated Interface values of successful results, sorted numerically.
+    
+    Raises:
+        BlizzardAPIError: If any result has an error, so a partial list is never written
+    """
+    failures = [r for r in results if r.error]
+    if failures:
+        raise BlizzardAPIError("; ".join(f"{r.product}/{r.region}: {r.error}" for r in failures))
+    return sorted({r.interface for r in results}, key=int)
+
+
+def format_interface_value(interfaces):
+    """Join Interface values the way the TOC expects (e.g., '50502, 110207')."""
+    return ", ".join(interfaces)
+
+
+def resolve_interfaces(products, region="us", **kwargs):
+    """
+    Fetch several products concurrently and return their combined Interface value.
+    
+    Args:
+        products: Product codes whose Interface values the TOC should list
+        region: Region row to read (default: us)
+        **kwargs: Passed to get_game_versions (cache, transport, policy, ...)
+    
+    Returns:
+        str: Sorted, deduplicated, comma-separated Interface value
+    
+    Raises:
+        BlizzardAPIError: If any product could not be resolved
+    """
+    results = get_game_versions(products, [region], **kwargs)
+    return format_interface_value(interfaces_from_results(results))
+
+
+def update_toc_interface(toc_path, interface_value):
+    """
+    Rewrite the `## Interface:` line of a TOC file in place.
+    
+    Returns:
+        bool: True if the file changed
+    
+    Raises:
+        BlizzardAPIError: If the TOC has no `## Interface:` line
+    """
+    toc_path = Path(toc_path)
+    content = toc_path.read_bytes().decode("utf-8")
+    
+    if not INTERFACE_LINE_PATTERN.search(content):
+        raise BlizzardAPIError(f"No '## Interface:' line found in {toc_path}")
+    
+    updated = INTERFACE_LINE_PATTERN.sub(f"## Interface: {interface_value}", content, count=1)
+    if updated == content:
+        return False
+    
+    toc_path.write_bytes(updated.encode("utf-8"))
+    return True
+
+
+def format_results_table(results):
+    """Render batch results as a fixed-width text table."""
+    header = ("PRODUCT", "REGION", "VERSION", "INTERFACE")
+    rows = [
+        (r.product, r.region, r.version or "-", r.interface or f"ERROR: {r.error}")
+        for r in results
+    ]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(3)]
+    lines = []
+    for row in [header] + rows:
+        lines.append("  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row[:3])) + "  " + row[3])
+    return "\n".join(lines)
+
+
+def format_latency_report(attempts):
+    """Summarize recorded attempts per host (count, median and max latency)."""
+    by_host = {}
+    for attempt in attempts:
+        by_host.setdefault(attempt.host, []).append(attempt)
+    
+    lines = [f"{'HOST':28} {'TRIES':>5} {'P50 MS':>8} {'MAX MS':>8}  OUTCOMES"]
+    for host, host_attempts in by_host.items():
+        latencies = sorted(a.latency_ms for a in host_attempts)
+        outcomes = sorted({a.outcome for a in host_attempts})
+        lines.append(f"{host:28} {len(latencies):5} {latencies[len(latencies) // 2]:8.0f} "
+                     f"{latencies[-1]:8.0f}  {', '.join(outcomes)}")
+    return "\n".join(lines)
+
+
+def parse_list_argument(value, known, name):
+    """Split a comma-separated CLI value, expanding 'all' to every known entry."""
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    if items == ["all"]:
+        return list(known)
+    unknown = [item for item in items if item not in known]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown {name}: {', '.join(unknown)}")
+    return items
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Query Blizzard API for WoW game version"
@@ -140,10 +729,270 @@ def main():
         default="both",
         help="What to output (default: both)"
     )
+    parser.add_argument(
+        "--products",
+        help="Batch mode: comma-separated product codes, or 'all' "
+             f"({', '.join(PRODUCTS)})"
+    )
+    parser.add_argument(
+        "--regions",
+        default="us",
+        help="Batch mode: comma-separated regions, or 'all' (default: us)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "json", "interface"],
+        default="table",
+        help="Batch mode output format; 'interface' prints the combined TOC Interface value (default: table)"
+    )
+    parser.add_argument(
+        "--write-toc",
+        nargs="?",
+        const=DEFAULT_TOC_PATH,
+        metavar="TOC",
+        help=f"Batch mode: rewrite the TOC '## Interface:' line in place (default TOC: {DEFAULT_TOC_PATH})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Batch mode: maximum concurrent requests (default: 8)"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default="http",
+        help="Patch server protocol: HTTP or native Ribbit TCP (default: http)"
+    )
+    parser.add_argument(
+        "--host",
+        help=f"Server host override (default: {PATCH_HOST} for http, {RIBBIT_HOST} for ribbit)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help=f"Server port override (default: {PATCH_PORT})"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Per-request socket timeout in seconds (default: {DEFAULT_TIMEOUT})"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Retries after a failed try, with jittered exponential backoff (default: 2)"
+    )
+    parser.add_argument(
+        "--hedge-delay",
+        type=float,
+        default=1.5,
+        help="Seconds to wait on a host before also asking the next hedge host (default: 1.5)"
+    )
+    parser.add_argument(
+        "--hedge-hosts",
+        default=",".join(HEDGE_HOSTS),
+        help="Comma-separated alternate hosts for hedged requests, empty to disable "
+             f"(default: {','.join(HEDGE_HOSTS)})"
+    )
+    parser.add_argument(
+        "--latency-report",
+        action="store_true",
+        help=f"Print per-host request latency (last {MAX_RECORDED_ATTEMPTS} requests) to stderr when done"
+    )
+    parser.add_argument(
+        "--record-history",
+        nargs="?",
+        const=DEFAULT_HISTORY_PATH,
+        metavar="DB",
+        help=f"Batch mode: append results to the version history (default DB: {DEFAULT_HISTORY_PATH})"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Poll continuously and print a JSON line whenever a product's build changes"
+    )
+    parser.add_argument(
+        "--on-change",
+        metavar="CMD",
+        help="Watch mode: shell command run per change (event JSON on stdin, BLIZZARD_* env vars)"
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=60,
+        help="Watch mode: poll interval right after a change, in seconds (default: 60)"
+    )
+    parser.add_argument(
+        "--fast-interval",
+        type=float,
+        default=120,
+        help="Watch mode: longest interval inside the patch window, in seconds (default: 120)"
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=1800,
+        help="Watch mode: longest interval while nothing changes, in seconds (default: 1800)"
+    )
+    parser.add_argument(
+        "--patch-days",
+        default="tue,wed",
+        help="Watch mode: weekdays (UTC) of the patch window (default: tue,wed)"
+    )
+    parser.add_argument(
+        "--patch-hours",
+        default="14-24",
+        help="Watch mode: UTC hour range of the patch window (default: 14-24)"
+    )
+    parser.add_argument(
+        "--max-polls",
+        type=int,
+        help="Watch mode: stop after this many polls"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Response cache directory (default: $BLIZZARD_API_CACHE_DIR or {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--max-age",
+        type=int,
+        default=0,
+        help="Serve cached responses younger than this many seconds without a request (default: 0)"
+    )
+    parser.add_argument(
+        "--stale-while-revalidate",
+        type=int,
+        default=0,
+        help="Serve responses up to this many seconds past --max-age while refreshing in the background (default: 0)"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Never contact the patch server; answer only from the cache"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the response cache"
+    )
     
     args = parser.parse_args()
     
-    version, interface = get_game_version(args.environment)
+    if args.no_cache and args.offline:
+        parser.error("--offline requires the cache")
+    
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(
+            args.cache_dir,
+            max_age=args.max_age,
+            stale_while_revalidate=args.stale_while_revalidate,
+            offline=args.offline
+        )
+    
+    policy = RequestPolicy(
+        retries=args.retries,
+        hedge_delay=args.hedge_delay,
+        hedge_hosts=[host.strip() for host in args.hedge_hosts.split(",") if host.strip()]
+    )
+    
+    if args.watch:
+        try:
+            products = (parse_list_argument(args.products, PRODUCTS, "product") if args.products
+                        else [ENVIRONMENT_PRODUCTS[args.environment]])
+            regions = parse_list_argument(args.regions, REGIONS, "region")
+            poller = AdaptivePoller(
+                min_interval=args.min_interval,
+                max_interval=args.max_interval,
+                fast_interval=args.fast_interval,
+                patch_days=parse_patch_days(args.patch_days),
+                patch_hours=parse_patch_hours(args.patch_hours)
+            )
+        except (argparse.ArgumentTypeError, ValueError) as e:
+            parser.error(str(e))
+        
+        history = VersionHistory(args.record_history) if args.record_history else None
+        
+        # One pool for the whole session keeps connections open between polls;
+        # with the cache enabled each poll is a conditional request (or, over
+        # Ribbit, a single summary request) unless a build actually changed
+        with ConnectionPool(timeout=args.timeout) as pool:
+            def poll():
+                return get_game_versions(products, regions, max_workers=args.workers, timeout=args.timeout,
+                                         cache=cache, transport=args.transport, policy=policy,
+                                         host=args.host, port=args.port, pool=pool)
+            
+            try:
+                watch(poll, poller, hook=args.on_change, max_polls=args.max_polls,
+                      on_results=history.record if history else None)
+            except KeyboardInterrupt:
+                print("[blizzard-api] Watch stopped", file=sys.stderr)
+            finally:
+                if cache:
+                    cache.drain()
+                if history:
+                    history.close()
+        
+        return 0
+    
+    if args.products:
+        try:
+            products = parse_list_argument(args.products, PRODUCTS, "product")
+            regions = parse_list_argument(args.regions, REGIONS, "region")
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        
+        results = get_game_versions(products, regions, max_workers=args.workers, timeout=args.timeout,
+                                    cache=cache, transport=args.transport, policy=policy,
+                                    host=args.host, port=args.port)
+        
+        interface_value = None
+        if args.format == "interface" or args.write_toc:
+            try:
+                interface_value = format_interface_value(interfaces_from_results(results))
+            except BlizzardAPIError as e:
+                print(f"Error: Could not resolve every Interface value: {e}", file=sys.stderr)
+                return 1
+        
+        if args.format == "json":
+            print(json.dumps([r._asdict() for r in results], indent=2))
+        elif args.format == "interface":
+            print(interface_value)
+        else:
+            print(format_results_table(results))
+        
+        if args.write_toc:
+            try:
+                changed = update_toc_interface(args.write_toc, interface_value)
+            except (BlizzardAPIError, OSError) as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            state = "Updated" if changed else "Unchanged"
+            print(f"[blizzard-api] {state} {args.write_toc}: ## Interface: {interface_value}", file=sys.stderr)
+        
+        if args.record_history:
+            with VersionHistory(args.record_history) as history:
+                appended = history.record(results)
+            print(f"[blizzard-api] Recorded {appended} new observation(s) in {args.record_history}",
+                  file=sys.stderr)
+        
+        if cache:
+            cache.drain()
+        
+        if args.latency_report and policy.attempts:
+            print(format_latency_report(policy.attempts), file=sys.stderr)
+        
+        return 1 if any(r.error for r in results) else 0
+    
+    version, interface = get_game_version(args.environment, cache=cache, transport=args.transport,
+                                          policy=policy, timeout=args.timeout, host=args.host, port=args.port)
+    
+    if args.latency_report and policy.attempts:
+        print(format_latency_report(policy.attempts), file=sys.stderr)
     
     if version is None or interface is None:
         sys.exit(1)
@@ -157,6 +1006,11 @@ def main():
         print(f"Version: {version}")
         print(f"Interface: {interface}")
     
+    if cache:
+        # Stale-while-revalidate refreshes finish after the answer is printed
+        sys.stdout.flush()
+        cache.drain()
+    
     return 0
 
 
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+On-disk response cache for Blizzard patch server queries.
+
+Entries are keyed by endpoint URL and store the body together with the
+ETag/Last-Modified validators, so an expired entry can be revalidated with
+a conditional request instead of a full download.
+
+Freshness policy:
+- age <= max_age                          -> served from disk, no request
+- age <= max_age + stale_while_revalidate -> served from disk, refreshed in background
+- older                                   -> conditional request (304 reuses the body)
+- offline, or the server fails            -> last cached body, if any
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+DEFAULT_CACHE_DIR = os.environ.get("BLIZZARD_API_CACHE_DIR", ".cache/blizzard-api")
+
+
+class ResponseCache:
+    """Persistent TTL cache with stale-while-revalidate and conditional requests."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_age=0, stale_while_revalidate=0, offline=False):
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.offline = offline
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{digest}.json"
+
+    def load(self, key):
+        """Return the cached entry for key, or None if missing or unreadable."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        return entry
+
+    def store(self, key, body, headers):
+        """Write an entry atomically so concurrent jobs never read a partial file."""
+        entry = {
+            "key": key,
+            "fetched_at": time.time(),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "body": body.decode("utf-8")
+        }
+        self._write(key, entry)
+        return entry
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[blizzard-cache] Warning: Could not write cache entry: {e}", file=sys.stderr)
+
+    def _revalidate(self, key, entry, request):
+        """Issue a conditional request and return the (possibly refreshed) entry."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        status, response_headers, body = request(headers)
+
+        if status == 304 and entry:
+            entry["fetched_at"] = time.time()
+            self._write(key, entry)
+            return entry
+        return self.store(key, body, response_headers)
+
+    def _revalidate_in_background(self, key, entry, request):
+        def worker():
+            try:
+                self._revalidate(key, entry, request)
+            except Exception as e:
+                print(f"[blizzard-cache] Background revalidation failed: {e}", file=sys.stderr)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        with self._lock:
+            # Forget finished revalidations so a long-running watch loop doesn't accumulate them
+            self._pending = [t for t in self._pending if t.is_alive()]
+            self._pending.append(thread)
+        thread.start()
+
+    def fetch(self, key, request):
+        """
+        Return the body for key, consulting the cache first.
+
+        Args:
+            key: Endpoint URL
+            request: Callable taking a dict of extra request headers and
+                returning (status, headers, body_bytes)
+
+        Returns:
+            Response body as bytes
+        """
+        entry = self.load(key)
+
+        if self.offline:
+            if entry is None:
+                raise LookupError(f"Offline and no cached response for {key}")
+            print(f"[blizzard-cache] Offline: using cached {key}", file=sys.stderr)
+            return entry["body"].encode("utf-8")
+
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age <= self.max_age:
+                print(f"[blizzard-cache] Fresh hit ({age:.0f}s old): {key}", file=sys.stderr)
+                return entry["body"].encode("utf-8")
+            if age <= self.max_age + self.stale_while_revalidate:
+                print(f"[blizzard-cache] Stale hit ({age:.0f}s old), revalidating: {key}", file=sys.stderr)
+                self._revalidate_in_background(key, entry, request)
+                return entry["body"].encode("utf-8")
+
+        try:
+            entry = self._revalidate(key, entry, request)
+        except Exception as e:
+            if entry is None:
+                raise
+            print(f"[blizzard-cache] Warning: {e}; falling back to cached {key}", file=sys.stderr)
+
+        return entry["body"].encode("utf-8")
+
+    def drain(self, timeout=None):
+        """Wait for background revalidations so their results reach disk."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for thread in pending:
+            thread.join(timeout)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Local history of observed WoW build versions.
+
+Every batch query can be recorded into an append-only SQLite store with one
+row per change of (product, region): version, build, seqn, Interface and
+the time it was first observed. Indexes on (product, region, time) and
+(product, region, version) make point-in-time and "since version" lookups
+O(log n) without re-querying Blizzard.
+
+Usage:
+    python3 blizzard_api.py --products all --regions us,eu --record-history
+    python3 blizzard_history.py at --product wow_beta --date 2025-11-01
+    python3 blizzard_history.py since --product wow --version 11.2.5
+    python3 blizzard_history.py latest
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+from datetime import UTC, datetime
+
+
+DEFAULT_HISTORY_PATH = os.environ.get("BLIZZARD_HISTORY_DB", ".cache/blizzard-history.sqlite3")
+
+Observation = namedtuple(
+    "Observation",
+    ["product", "region", "version", "build", "interface", "seqn", "observed_at"]
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    product TEXT NOT NULL,
+    region TEXT NOT NULL,
+    version TEXT NOT NULL,
+    major INTEGER NOT NULL,
+    minor INTEGER NOT NULL,
+    patch INTEGER NOT NULL,
+    build INTEGER NOT NULL,
+    interface INTEGER,
+    seqn INTEGER,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS observations_by_time
+    ON observations (product, region, observed_at);
+CREATE INDEX IF NOT EXISTS observations_by_version
+    ON observations (product, region, major, minor, patch, build);
+"""
+
+_COLUMNS = "product, region, version, build, interface, seqn, observed_at"
+
+
+def version_key(version):
+    """
+    Split a version into a sortable (major, minor, patch, build) tuple.
+
+    Missing parts count as 0, so "11.2.5" sorts before every 11.2.5.x build.
+
+    Raises:
+        ValueError: If the version is not dot-separated integers
+    """
+    parts = [int(part) for part in version.split(".")]
+    if not 1 <= len(parts) <= 4:
+        raise ValueError(f"Invalid version '{version}'")
+    return tuple(parts + [0] * (4 - len(parts)))
+
+
+def parse_timestamp(value):
+    """Parse an ISO date/datetime (UTC if no zone) or a Unix timestamp into epoch seconds."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
+
+def format_timestamp(epoch):
+    return datetime.fromtimestamp(epoch, UTC).strftime("%Y-%m-%d %H:%M:%SZ")
+
+
+class VersionHistory:
+    """Append-only store of build observations."""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def latest(self, product, region="us"):
+        """Return the most recent observation for a product/region, or None."""
+        row = self._db.execute(
+            f"SELECT {_COLUMNS} FROM observations WHERE product = ? AND region = ? "
+            "ORDER BY observed_at DESC LIMIT 1",
+            (product, region)
+        ).fetchone()
+        return Observation(*row) if row else None
+
+    def record(self, results, observed_at=None):
+        """
+        Append observations from blizzard_api VersionResult rows.
+
+        Rows with errors are skipped, as are rows identical (version, build,
+        seqn) to the latest stored observation of their product/region, so the
+        store only grows when something actually changed.
+
+        Returns:
+            int: Number of rows appended
+        """
+        observed_at = time.time() if observed_at is None else observed_at
+        appended = 0
+        with self._db:
+            for result in results:
+                if result.error or not result.version:
+                    continue
+                previous = self.latest(result.product, result.region)
+                if previous and (previous.version, previous.build, previous.seqn) == \
+                        (result.version, result.build, result.seqn):
+                    continue
+                major, minor, patch, build = version_key(result.version)
+                self._db.execute(
+                    "INSERT INTO observations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (result.product, result.region, result.version, major, minor, patch,
+                     result.build if result.build is not None else build,
+                     int(result.interface) if result.interface else None, result.seqn, observed_at)
+                )
+                appended += 1
+        return appended
+
+    def at(self, product, when, region="us"):
+        """Return the observation that was current at epoch time `when`, or None."""
+        row = self._db.execute(
+            f"SELECT {_COLUMNS} FROM observations WHERE product = ? AND region = ? AND observed_at <= ? "
+            "ORDER BY observed_at DESC LIMIT 1",
+            (product, region, when)
+        ).fetchone()
+        return Observation(*row) if row else None
+
+    def since(self, product, version, region="us"):
+        """Return the first observation of every build at or after `version`, oldest version first."""
+        rows = self._db.execute(
+            # SQLite takes the bare columns from the row that holds MIN(observed_at)
+            "SELECT product, region, version, build, interface, seqn, MIN(observed_at) "
+            "FROM observations WHERE product = ? AND region = ? "
+            "AND (major, minor, patch, build) >= (?, ?, ?, ?) "
+            "GROUP BY major, minor, patch, build "
+            "ORDER BY major, minor, patch, build",
+            (product, region, *version_key(version))
+        ).fetchall()
+        return [Observation(*row) for row in rows]
+
+    def products(self):
+        """Return every (product, region) pair with at least one observation."""
+        return self._db.execute(
+            "SELECT DISTINCT product, region FROM observations ORDER BY product, region"
+        ).fetchall()
+
+
+def _print_observations(observations):
+    print(f"{'PRODUCT':20} {'REGION':6} {'VERSION':14} {'INTERFACE':9}  {'SEQN':>9}  FIRST SEEN")
+    for o in observations:
+        print(f"{o.product:20} {o.region:6} {o.version:14} {o.interface or '-'!s:9}  "
+              f"{o.seqn if o.seqn is not None else '-'!s:>9}  {format_timestamp(o.observed_at)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query the local history of observed WoW build versions"
+    )
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_HISTORY_PATH,
+        help=f"History database (default: $BLIZZARD_HISTORY_DB or {DEFAULT_HISTORY_PATH})"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    at_parser = subparsers.add_parser("at", help="Show the build that was current at a point in time")
+    at_parser.add_argument("--product", required=True, help="Product code (e.g., wow_beta)")
+    at_parser.add_argument("--region", default="us", help="Region (default: us)")
+    at_parser.add_argument("--date", required=True, help="ISO date/datetime (UTC) or Unix timestamp")
+    at_parser.add_argument("--output", choices=["interface", "version", "row"], default="row",
+                           help="What to output (default: row)")
+
+    since_parser = subparsers.add_parser("since", help="List builds at or after a version")
+    since_parser.add_argument("--product", required=True, help="Product code (e.g., wow)")
+    since_parser.add_argument("--region", default="us", help="Region (default: us)")
+    since_parser.add_argument("--version", required=True, help="Version prefix (e.g., 11.2.5)")
+
+    subparsers.add_parser("latest", help="Show the latest observation of every product and region")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: History database '{args.db}' not found", file=sys.stderr)
+        return 1
+
+    with VersionHistory(args.db) as history:
+        if args.command == "at":
+            try:
+                when = parse_timestamp(args.date)
+            except ValueError:
+                parser.error(f"Invalid --date '{args.date}'")
+            observation = history.at(args.product, when, args.region)
+            if observation is None:
+                print(f"Error: No {args.product}/{args.region} observation at or before {args.date}",
+                      file=sys.stderr)
+                return 1
+            if args.output == "interface":
+                print(observation.interface)
+            elif args.output == "version":
+                print(observation.version)
+            else:
+                _print_observations([observation])
+
+        elif args.command == "since":
+            try:
+                observations = history.since(args.product, args.version, args.region)
+            except ValueError as e:
+                parser.error(str(e))
+            _print_observations(observations)
+
+        else:
+            _print_observations([history.latest(product, region) for product, region in history.products()])
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
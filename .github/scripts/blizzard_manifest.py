@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Parser for TACT pipe-separated manifests served by Blizzard's patch server.
+
+The `versions`, `cdns` and `bgdl` files (and the Ribbit `summary`) share one
+format: a header line describing each column as `Name!TYPE:size`, optional
+`## key = value` comment lines such as the sequence number, and one row per
+region/product:
+
+    Region!STRING:0|BuildConfig!HEX:16|CDNConfig!HEX:16|KeyRing!HEX:16|BuildId!DEC:4|VersionsName!String:0|ProductConfig!HEX:16
+    ## seqn = 3263340
+    us|4a7b...|a1c2...||64978|11.2.7.64978|53020...
+
+The header is read once to build a column index and a record type; rows are
+decoded lazily, straight from the response bytes, when they are iterated, so
+a row that is not UTF-8 raises ManifestError from iteration or lookups.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+
+Column = namedtuple("Column", ["name", "type", "size"])
+
+
+class ManifestError(ValueError):
+    """Raised when a manifest has no usable header, or a line is not UTF-8."""
+
+
+def _decode_utf8(raw):
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise ManifestError(f"Invalid UTF-8 in manifest: {raw!r}") from e
+
+
+def _decode_value(raw, column_type):
+    """Convert one raw cell to the Python type implied by its column type."""
+    value = _decode_utf8(raw)
+    if column_type == "DEC":
+        return int(value) if value.isdigit() else None
+    if column_type == "HEX":
+        return value.lower()
+    return value
+
+
+def parse_header(line):
+    """
+    Parse a `Name!TYPE:size|...` header line into Column tuples.
+
+    Raises:
+        ManifestError: If a column is not in `Name!TYPE:size` form, or a name repeats
+    """
+    columns = []
+    names = set()
+    for cell in line.split(b"|"):
+        name, sep, spec = _decode_utf8(cell).strip().partition("!")
+        if not sep or not name:
+            raise ManifestError(f"Invalid manifest header column: {cell!r}")
+        if name in names:
+            raise ManifestError(f"Duplicate manifest header column: {name!r}")
+        names.add(name)
+        column_type, _, size = spec.partition(":")
+        columns.append(Column(name, column_type.upper(), int(size) if size.isdigit() else 0))
+    return columns
+
+
+@lru_cache(maxsize=32)
+def _record_type(names):
+    """
+    Return a namedtuple class for a header; cached because class creation is slow.
+
+    Names that are not valid identifiers (or are keywords) become positional
+    field names (`_1`, ...); Column.name and column_index keep the originals.
+    """
+    return namedtuple("ManifestRecord", names, rename=True)
+
+
+def _parse_comment(line, comments):
+    """Record a `## key = value` comment line."""
+    key, sep, value = _decode_utf8(line.lstrip(b"#")).partition("=")
+    if sep:
+        comments[key.strip().lower()] = value.strip()
+
+
+class Manifest:
+    """
+    A parsed TACT manifest.
+
+    Attributes:
+        columns: List of Column tuples from the header
+        record_type: namedtuple class with one field per column
+        seqn: Sequence number from the `## seqn = N` line, or None
+        comments: All `## key = value` comment lines, keys lower-cased
+    """
+
+    def __init__(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._data = data
+        self.comments = {}
+        self.columns = None
+
+        # Read the preamble (blank lines, comments and the header) eagerly;
+        # everything after it is left for lazy row decoding
+        pos = 0
+        end = len(data)
+        while pos < end:
+            line_end = data.find(b"\n", pos)
+            if line_end == -1:
+                line_end = end
+            line = data[pos:line_end].strip()
+            if line and self.columns is not None and not line.startswith(b"#"):
+                break
+            pos = line_end + 1
+            if not line:
+                continue
+            if line.startswith(b"#"):
+                _parse_comment(line, self.comments)
+            else:
+                self.columns = parse_header(line)
+
+        if self.columns is None:
+            raise ManifestError("Manifest has no header line")
+
+        self._rows_start = min(pos, end)
+        self._index = {column.name: i for i, column in enumerate(self.columns)}
+        self.record_type = _record_type(tuple(column.name for column in self.columns))
+
+    @property
+    def seqn(self):
+        value = self.comments.get("seqn")
+        return int(value) if value and value.isdigit() else None
+
+    def column_index(self, name):
+        """Return the position of a column by name, or raise KeyError."""
+        return self._index[name]
+
+    def _raw_rows(self):
+        """Yield the raw bytes of each data row, skipping blanks and comments."""
+        data = self._data
+        pos = self._rows_start
+        end = len(data)
+        while pos < end:
+            line_end = data.find(b"\n", pos)
+            if line_end == -1:
+                line_end = end
+            line = data[pos:line_end].rstrip(b"\r")
+            pos = line_end + 1
+            if not line.strip():
+                continue
+            if line.startswith(b"#"):
+                _parse_comment(line, self.comments)
+                continue
+            yield line
+
+    def _decode(self, line):
+        cells = line.split(b"|")
+        cells.extend([b""] * (len(self.columns) - len(cells)))
+        return self.record_type._make(
+            _decode_value(cell, column.type) for cell, column in zip(cells, self.columns)
+        )
+
+    def __iter__(self):
+        for line in self._raw_rows():
+            yield self._decode(line)
+
+    def find(self, column, value):
+        """
+        Return the first record whose column equals value, or None.
+
+        Only the cells up to the requested column are split for rows that
+        do not match, so lookups stay cheap on wide manifests.
+        """
+        index = self._index[column]
+        column_type = self.columns[index].type
+        for line in self._raw_rows():
+            cells = line.split(b"|", index + 1)
+            if index < len(cells) and _decode_value(cells[index], column_type) == value:
+                return self._decode(line)
+        return None
+
+    def index_by(self, column):
+        """Return a dict mapping each row's column value to its record (first row wins)."""
+        index = self._index[column]
+        records = {}
+        for record in self:
+            records.setdefault(record[index], record)
+        return records
+
+
+def parse_manifest(data):
+    """Parse manifest bytes (or text) into a Manifest."""
+    return Manifest(data)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Ribbit client for Blizzard's native version protocol.
+
+Ribbit is the plain TCP protocol behind `<region>.version.battle.net:1119`.
+A client sends one command line (e.g. `v2/products/wow/versions`) and the
+server replies with the manifest and closes the connection:
+
+- v1 wraps the manifest in a signed MIME message with a SHA-256 checksum trailer
+- v2 returns the bare pipe-separated manifest
+
+The `summary` command lists the current sequence number of every product
+file, so a poller only needs to download a product's `versions` file when
+its sequence number differs from the cached copy.
+"""
+
+import email
+import hashlib
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from blizzard_manifest import ManifestError, parse_manifest
+
+
+RIBBIT_HOST = "us.version.battle.net"
+RIBBIT_PORT = 1119
+DEFAULT_TIMEOUT = 10
+
+# Summary `Flags` value for each product file
+FILE_FLAGS = {
+    "versions": "",
+    "cdns": "cdn",
+    "bgdl": "bgdl"
+}
+
+
+class RibbitError(Exception):
+    """Raised when a Ribbit request fails or returns a malformed response."""
+
+
+def parse_v1_response(data):
+    """
+    Extract the manifest from a Ribbit v1 MIME response.
+
+    Verifies the `Checksum:` trailer (SHA-256 of everything before it) when
+    present, then returns the first non-signature part.
+
+    Raises:
+        RibbitError: On checksum mismatch or if no data part is found
+    """
+    message_bytes, sep, trailer = data.rpartition(b"Checksum: ")
+    if sep:
+        expected = trailer.strip().decode("ascii", "replace").lower()
+        actual = hashlib.sha256(message_bytes).hexdigest()
+        if expected != actual:
+            raise RibbitError(f"Checksum mismatch (expected {expected}, got {actual})")
+    else:
+        message_bytes = data
+
+    message = email.message_from_bytes(message_bytes)
+    for part in message.walk():
+        if part.is_multipart():
+            continue
+        if "signature" in part.get("Content-Disposition", "").lower():
+            continue
+        payload = part.get_payload(decode=True)
+        if payload is not None:
+            return payload
+
+    raise RibbitError("Ribbit v1 response contains no data part")
+
+
+class RibbitClient:
+    """Minimal Ribbit v1/v2 client: one TCP connection per command."""
+
+    def __init__(self, host=RIBBIT_HOST, port=RIBBIT_PORT, protocol=2, timeout=DEFAULT_TIMEOUT):
+        if protocol not in (1, 2):
+            raise ValueError(f"Unsupported Ribbit protocol version: {protocol}")
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.timeout = timeout
+
+    def request(self, command):
+        """
+        Send one command (without the `vN/` prefix) and return the manifest bytes.
+
+        Raises:
+            RibbitError: On connection failure or malformed v1 response
+        """
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+                sock.sendall(f"v{self.protocol}/{command}\r\n".encode("ascii"))
+                chunks = []
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+        except OSError as e:
+            raise RibbitError(f"Failed to reach {self.host}:{self.port}: {e}") from e
+
+        data = b"".join(chunks)
+        if not data:
+            raise RibbitError(f"Empty Ribbit response for '{command}'")
+        if self.protocol == 1:
+            return parse_v1_response(data)
+        return data
+
+    def summary(self):
+        """
+        Return the current sequence numbers of every product file.
+
+        Returns:
+            dict: {(product, flags): seqn}, where flags is '' for `versions`
+        """
+        try:
+            manifest = parse_manifest(self.request("summary"))
+            return {(record.Product, record.Flags or ""): record.Seqn for record in manifest}
+        except (ManifestError, AttributeError) as e:
+            raise RibbitError(f"Malformed Ribbit summary: {e}") from e
+
+    def product_file(self, product, file_name="versions"):
+        """Download a product's `versions`, `cdns` or `bgdl` manifest."""
+        return self.request(f"products/{product}/{file_name}")
+
+    def cache_key(self, product, file_name="versions"):
+        """Return the ResponseCache key for a product file on this server."""
+        return f"ribbit://{self.host}:{self.port}/products/{product}/{file_name}"
+
+    def fetch_changed(self, products, file_name="versions", cache=None, max_workers=8):
+        """
+        Fetch product files, downloading only those whose seqn changed.
+
+        With a cache, the summary is fetched first and each product's cached
+        body is reused when its `## seqn` matches the summary; only changed
+        products are downloaded (concurrently). Without a cache every file
+        is downloaded.
+
+        Returns:
+            dict: {product: (body_bytes or RibbitError, changed)}
+        """
+        products = list(dict.fromkeys(products))
+        results = {}
+        cached = {}
+
+        if cache is not None:
+            for product in products:
+                entry = cache.load(self.cache_key(product, file_name))
+                if entry is not None:
+                    cached[product] = entry["body"].encode("utf-8")
+
+            if cache.offline:
+                for product in products:
+                    if product in cached:
+                        results[product] = (cached[product], False)
+                    else:
+                        results[product] = (RibbitError(f"Offline and no cached {file_name} for {product}"), False)
+                return results
+
+            seqns = None
+            if cached:
+                try:
+                    seqns = self.summary()
+                except RibbitError as e:
+                    print(f"[ribbit] Warning: summary failed ({e}); using cached manifests", file=sys.stderr)
+
+            flags = FILE_FLAGS.get(file_name, file_name)
+            for product, body in cached.items():
+                if seqns is None:
+                    results[product] = (body, False)
+                    continue
+                try:
+                    cached_seqn = parse_manifest(body).seqn
+                except ManifestError:
+                    continue
+                if cached_seqn is not None and seqns.get((product, flags)) == cached_seqn:
+                    print(f"[ribbit] {product}/{file_name} unchanged (seqn {cached_seqn})", file=sys.stderr)
+                    results[product] = (body, False)
+
+        to_download = [product for product in products if product not in results]
+
+        def download(product):
+            try:
+                return product, self.product_file(product, file_name)
+            except RibbitError as e:
+                return product, e
+
+        if to_download:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_download)))) as executor:
+                for product, body in executor.map(download, to_download):
+                    if isinstance(body, RibbitError):
+                        # Prefer an outdated manifest over no answer at all
+                        results[product] = (cached.get(product, body), False)
+                        continue
+                    if cache is not None:
+                        cache.store(self.cache_key(product, file_name), body, {})
+                    results[product] = (body, True)
+
+        return results
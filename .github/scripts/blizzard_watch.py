@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Long-running watch loop for Blizzard build changes.
+
+Used by `blizzard_api.py --watch`. Each poll is expected to be cheap (a
+conditional HTTP request over a kept-open connection, or a Ribbit summary),
+and the loop only emits an event when a product's build actually changes.
+
+The poll interval adapts: it drops to `min_interval` right after a change,
+stays at most `fast_interval` inside the weekly patch window (maintenance
+Tuesday/Wednesday), and otherwise backs off geometrically up to
+`max_interval` while nothing changes.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+
+
+# Weekly maintenance: Tuesday (US) and Wednesday (EU), from 14:00 UTC
+DEFAULT_PATCH_DAYS = (1, 2)
+DEFAULT_PATCH_HOURS = (14, 24)
+
+WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+
+def parse_patch_days(value):
+    """Parse 'tue,wed' into weekday numbers (Monday is 0)."""
+    days = []
+    for day in value.split(","):
+        day = day.strip().lower()[:3]
+        if not day:
+            continue
+        if day not in WEEKDAYS:
+            raise ValueError(f"Unknown weekday '{day}'")
+        days.append(WEEKDAYS[day])
+    return tuple(days)
+
+
+def parse_patch_hours(value):
+    """Parse '14-24' into a (start, end) UTC hour range."""
+    start, _, end = value.partition("-")
+    hours = (int(start), int(end))
+    if not 0 <= hours[0] < hours[1] <= 24:
+        raise ValueError(f"Invalid hour range '{value}'")
+    return hours
+
+
+class AdaptivePoller:
+    """Chooses the delay before the next poll from recent change history."""
+
+    def __init__(self, min_interval=60, max_interval=1800, fast_interval=120, backoff=2.0,
+                 patch_days=DEFAULT_PATCH_DAYS, patch_hours=DEFAULT_PATCH_HOURS):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.fast_interval = max(fast_interval, min_interval)
+        self.backoff = backoff
+        self.patch_days = tuple(patch_days)
+        self.patch_hours = tuple(patch_hours)
+        self.interval = min_interval
+
+    def in_patch_window(self, now=None):
+        now = datetime.now(UTC) if now is None else now
+        return now.weekday() in self.patch_days and self.patch_hours[0] <= now.hour < self.patch_hours[1]
+
+    def next_interval(self, changed, now=None):
+        """Return seconds to wait after a poll; `changed` is True if any build changed."""
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        if self.in_patch_window(now):
+            self.interval = min(self.interval, self.fast_interval)
+        return self.interval
+
+
+def diff_results(previous, results, observed_at=None):
+    """
+    Compare a poll's VersionResult rows with the last known state.
+
+    Updates `previous` ({(product, region): VersionResult}) in place and
+    returns one `build_changed` event per product/region whose version or
+    build moved. Rows with errors are ignored so a failed poll never looks
+    like a change. Products seen for the first time produce no event.
+    """
+    observed_at = time.time() if observed_at is None else observed_at
+    events = []
+    for result in results:
+        if result.error:
+            continue
+        key = (result.product, result.region)
+        old = previous.get(key)
+        previous[key] = result
+        if old is None or (old.version, old.build) == (result.version, result.build):
+            continue
+        events.append({
+            "event": "build_changed",
+            "product": result.product,
+            "region": result.region,
+            "old_version": old.version,
+            "new_version": result.version,
+            "old_build": old.build,
+            "new_build": result.build,
+            "old_interface": old.interface,
+            "new_interface": result.interface,
+            "seqn": result.seqn,
+            "observed_at": datetime.fromtimestamp(observed_at, UTC).isoformat()
+        })
+    return events
+
+
+def emit_event(event, hook=None):
+    """
+    Print an event as one JSON line and optionally run a hook command.
+
+    The hook receives the event JSON on stdin and the main fields as
+    BLIZZARD_* environment variables.
+    """
+    line = json.dumps(event, sort_keys=True)
+    print(line, flush=True)
+
+    if not hook:
+        return
+
+    env = {**os.environ}
+    for key, value in event.items():
+        env[f"BLIZZARD_{key.upper()}"] = "" if value is None else str(value)
+    try:
+        result = subprocess.run(hook, shell=True, input=line, text=True, env=env, check=False)
+        if result.returncode != 0:
+            print(f"[blizzard-watch] Warning: hook exited with {result.returncode}", file=sys.stderr)
+    except OSError as e:
+        print(f"[blizzard-watch] Warning: hook failed: {e}", file=sys.stderr)
+
+
+def watch(poll, poller, hook=None, max_polls=None, on_results=None, sleep=time.sleep):
+    """
+    Poll until interrupted (or max_polls), emitting events for build changes.
+
+    Args:
+        poll: Callable returning a list of VersionResult rows
+        poller: AdaptivePoller choosing the delay between polls
+        hook: Optional shell command run for each event
+        max_polls: Stop after this many polls (default: run forever)
+        on_results: Optional callable receiving each poll's results (e.g., history recording)
+        sleep: Sleep function (replaceable for testing)
+
+    Returns:
+        int: Number of change events emitted
+    """
+    state = {}
+    emitted = 0
+    polls = 0
+
+    while max_polls is None or polls < max_polls:
+        polls += 1
+        try:
+            results = poll()
+        except Exception as e:
+            print(f"[blizzard-watch] Poll {polls} failed: {e}", file=sys.stderr)
+            results = []
+
+        if on_results and results:
+            on_results(results)
+
+        first_poll = not state
+        events = diff_results(state, results)
+        for event in events:
+            emit_event(event, hook)
+        emitted += len(events)
+
+        failed = sum(1 for r in results if r.error)
+        interval = poller.next_interval(bool(events))
+        status = "baseline" if first_poll else f"{len(events)} change(s)"
+        print(f"[blizzard-watch] Poll {polls}: {status}, {failed} error(s); next poll in {interval:.0f}s",
+              file=sys.stderr)
+
+        if max_polls is not None and polls >= max_polls:
+            break
+        sleep(interval)
+
+    return emitted
@@ -6,32 +6,27 @@ Used in PR validation to ensure version field is updated.
 """
 
 import argparse
-import re
 import subprocess
 import sys
-from pathlib import Path
+
+from toc_model import load_toc, parse_toc_text, toc_path_for
 
 
 def extract_version(toc_content):
     """Extract version from TOC file content."""
-    pattern = re.compile(r"^## Version:\s*(.+)$", re.MULTILINE | re.IGNORECASE)
-    match = pattern.search(toc_content)
-    if match:
-        return match.group(1).strip()
-    return None
+    return parse_toc_text(toc_content).version or None
 
 
 def get_current_version(addon_name):
-    """Get version from current TOC file."""
-    toc_path = Path(addon_name) / f"{addon_name}.toc"
+    """Get version from current TOC file (or the saved TOC in $TOC_JSON)."""
+    toc_path = toc_path_for(addon_name)
     
-    if not toc_path.exists():
+    try:
+        version = load_toc(addon_name).version
+    except FileNotFoundError:
         print(f"::error ::TOC file '{toc_path}' not found in PR branch")
         return None
     
-    content = toc_path.read_text(encoding="utf-8")
-    version = extract_version(content)
-    
     if not version:
         print(f"::error ::No '## Version:' line found in {toc_path} on PR branch")
         return None
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Blizzard's patch server (HTTP) and version server (Ribbit).
+
+Serves recorded or generated `versions`/`cdns` manifests so blizzard_api.py
+can be exercised and benchmarked without network access. Latency, jitter,
+error rate and payload size are configurable.
+
+Usage:
+    python3 fake_patch_server.py --http-port 11190 --ribbit-port 11191 --latency 0.05
+    python3 blizzard_api.py --products all --host 127.0.0.1 --port 11190 --hedge-hosts "" --no-cache
+    python3 blizzard_api.py --products all --transport ribbit --host 127.0.0.1 --port 11191 --no-cache
+
+Recorded payloads can be served from a directory laid out as
+`<payload-dir>/<product>/<file>` (e.g., `recorded/wow_beta/versions`).
+"""
+
+import argparse
+import hashlib
+import http.server
+import random
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+VERSIONS_HEADER = (
+    "Region!STRING:0|BuildConfig!HEX:16|CDNConfig!HEX:16|KeyRing!HEX:16|"
+    "BuildId!DEC:4|VersionsName!String:0|ProductConfig!HEX:16"
+)
+
+CDNS_HEADER = "Name!STRING:0|Path!STRING:0|Hosts!STRING:0|Servers!STRING:0|ConfigPath!STRING:0"
+
+# Versions as recorded from the live patch server for each product
+RECORDED_VERSIONS = {
+    "wow": "11.2.7.64978",
+    "wow_beta": "12.0.1.64914",
+    "wowt": "11.2.7.65012",
+    "wowxptr": "11.2.7.64743",
+    "wow_classic": "5.5.2.64967",
+    "wow_classic_beta": "5.5.3.65056",
+    "wow_classic_ptr": "5.5.3.65012",
+    "wow_classic_era": "1.15.8.64907",
+    "wow_classic_era_ptr": "1.15.8.65045"
+}
+
+RECORDED_REGIONS = ("us", "eu", "cn", "kr", "tw", "sg", "xx")
+
+
+def _hex(*parts):
+    return hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def build_versions_payload(product, version, seqn, payload_size=0):
+    """
+    Build a `versions` manifest in the patch server's format.
+
+    Rows are generated for the recorded regions; when payload_size (bytes)
+    is larger than that, synthetic regions are appended until it is reached.
+    """
+    build = version.rsplit(".", 1)[-1]
+    lines = [VERSIONS_HEADER, f"## seqn = {seqn}"]
+
+    def row(region):
+        return "|".join([
+            region, _hex(product, version, "build"), _hex(product, version, "cdn"), "",
+            build, version, _hex(product, version, "product")
+        ])
+
+    lines.extend(row(region) for region in RECORDED_REGIONS)
+    size = sum(len(line) + 1 for line in lines)
+    extra = 0
+    while size < payload_size:
+        line = row(f"x{extra:04d}")
+        lines.append(line)
+        size += len(line) + 1
+        extra += 1
+
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def build_cdns_payload(product, seqn):
+    """Build a small `cdns` manifest for a product."""
+    lines = [CDNS_HEADER, f"## seqn = {seqn}"]
+    for region in RECORDED_REGIONS:
+        lines.append(f"{region}|tpr/wow|level3.blizzard.com {region}.cdn.blizzard.com|"
+                     f"http://{region}.cdn.blizzard.com/?maxhosts=4|tpr/configs/data")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def default_payloads(payload_size=0, seqn=3263340):
+    """Return {(product, file_name): bytes} for every recorded product."""
+    payloads = {}
+    for offset, (product, version) in enumerate(RECORDED_VERSIONS.items()):
+        payloads[(product, "versions")] = build_versions_payload(product, version, seqn + offset, payload_size)
+        payloads[(product, "cdns")] = build_cdns_payload(product, seqn + 100 + offset)
+    return payloads
+
+
+def load_payload_dir(payload_dir):
+    """Load recorded payloads from `<payload_dir>/<product>/<file_name>`."""
+    payloads = {}
+    for path in sorted(Path(payload_dir).glob("*/*")):
+        if path.is_file():
+            payloads[(path.parent.name, path.name)] = path.read_bytes()
+    return payloads
+
+
+def build_summary(payloads):
+    """Build a Ribbit `summary` manifest from the payloads' `## seqn` lines."""
+    flags = {"versions": "", "cdns": "cdn", "bgdl": "bgdl"}
+    lines = ["Product!STRING:0|Seqn!DEC:4|Flags!STRING:0", "## seqn = 1"]
+    for (product, file_name), body in sorted(payloads.items()):
+        for line in body.splitlines():
+            if line.startswith(b"## seqn"):
+                seqn = line.split(b"=", 1)[1].strip().decode("ascii")
+                lines.append(f"{product}|{seqn}|{flags.get(file_name, file_name)}")
+                break
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def wrap_ribbit_v1(body):
+    """Wrap a manifest in a Ribbit v1 MIME message with a checksum trailer."""
+    message = (
+        b"MIME-Version: 1.0\r\n"
+        b'Content-Type: multipart/alternative; boundary="FakePatchServer"\r\n'
+        b"\r\n"
+        b"--FakePatchServer\r\n"
+        b"Content-Type: text/plain\r\n"
+        b"Content-Disposition: version\r\n"
+        b"\r\n" + body + b"\r\n"
+        b"--FakePatchServer\r\n"
+        b"Content-Type: application/cms\r\n"
+        b"Content-Disposition: signature\r\n"
+        b"\r\n"
+        b"unsigned\r\n"
+        b"--FakePatchServer--\r\n"
+    )
+    return message + b"Checksum: " + hashlib.sha256(message).hexdigest().encode("ascii") + b"\n"
+
+
+class _ReusableTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+class FakePatchServer:
+    """
+    HTTP and Ribbit servers backed by in-memory payloads.
+
+    Args:
+        payloads: {(product, file_name): bytes} (default: default_payloads())
+        latency: Seconds to wait before answering each request
+        jitter: Extra random delay, uniform in [0, jitter] seconds
+        error_rate: Fraction of requests answered with HTTP 503 / dropped connections
+        host: Interface to bind
+        http_port: HTTP port (0 picks a free port, None disables HTTP)
+        ribbit_port: Ribbit port (0 picks a free port, None disables Ribbit)
+        seed: Random seed for reproducible jitter and errors
+    """
+
+    def __init__(self, payloads=None, latency=0.0, jitter=0.0, error_rate=0.0, host="127.0.0.1",
+                 http_port=0, ribbit_port=0, seed=None):
+        self.payloads = payloads if payloads is not None else default_payloads()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.host = host
+        self.http_port = http_port
+        self.ribbit_port = ribbit_port
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._servers = []
+
+    def _delay_and_fail(self):
+        """Apply configured latency; return True if this request should fail."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _http_handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if server._delay_and_fail():
+                    self._reply(503, b"Service Unavailable\n")
+                    return
+                _, product, file_name = (self.path.split("?", 1)[0].split("/") + ["", ""])[:3]
+                body = server.payloads.get((product, file_name))
+                if body is None:
+                    self._reply(404, b"Not Found\n")
+                    return
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._reply(304, b"", etag)
+                    return
+                self._reply(200, body, etag)
+
+            def _reply(self, status, body, etag=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _ribbit_handler(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                command = self.rfile.readline().strip().decode("ascii", "replace")
+                if server._delay_and_fail():
+                    return  # Drop the connection without a reply
+                protocol, _, path = command.partition("/")
+                parts = path.split("/")
+                if parts == ["summary"]:
+                    body = build_summary(server.payloads)
+                elif len(parts) == 3 and parts[0] == "products":
+                    body = server.payloads.get((parts[1], parts[2]))
+                else:
+                    body = None
+                if body is None:
+                    return
+                self.wfile.write(wrap_ribbit_v1(body) if protocol == "v1" else body)
+
+        return Handler
+
+    def _serve(self, server_class, port, handler):
+        server = server_class((self.host, port), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._servers.append(server)
+        return server.server_address[1]
+
+    def start(self):
+        """Start the configured listeners and record their bound ports."""
+        if self.http_port is not None:
+            self.http_port = self._serve(http.server.ThreadingHTTPServer, self.http_port, self._http_handler())
+        if self.ribbit_port is not None:
+            self.ribbit_port = self._serve(_ReusableTCPServer, self.ribbit_port, self._ribbit_handler())
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a local stand-in for Blizzard's patch and Ribbit servers"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--http-port", type=int, default=11190, help="HTTP port (default: 11190)")
+    parser.add_argument("--ribbit-port", type=int, default=11191, help="Ribbit port (default: 11191)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Response delay in seconds (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay in seconds (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests that fail, 0.0-1.0 (default: 0)")
+    parser.add_argument("--payload-size", type=int, default=0,
+                        help="Pad generated versions files to at least this many bytes (default: 0)")
+    parser.add_argument("--payload-dir", help="Serve recorded payloads from <dir>/<product>/<file>")
+
+    args = parser.parse_args()
+
+    payloads = load_payload_dir(args.payload_dir) if args.payload_dir else default_payloads(args.payload_size)
+    server = FakePatchServer(payloads, args.latency, args.jitter, args.error_rate, args.host,
+                             args.http_port, args.ribbit_port).start()
+
+    print(f"[fake-patch-server] HTTP on {args.host}:{server.http_port}, Ribbit on {args.host}:{server.ribbit_port}")
+    print(f"[fake-patch-server] Serving {len(payloads)} payload(s); press Ctrl+C to stop")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Pack small UI icons into one texture atlas.
+
+Reads every .tga in a source directory and packs them into a single
+power-of-two TGA. It also writes a Lua file with each icon's texture
+coordinates, so frames can share one texture and select an icon with
+`SetTexCoord` instead of loading a file per icon:
+
+    SF:SetIconTexture(button:GetNormalTexture(), "gear")
+
+Each icon is surrounded by `--padding` pixels copied from its own edge,
+so bilinear filtering never blends in a neighbouring icon. Outputs are
+deterministic and only rewritten when their content changes. `--check`
+fails if they are out of date, for CI.
+
+Icon sources placed under media/ are referenced only through the atlas,
+so packaging leaves them out (see addon_media.py).
+
+Usage:
+    python3 icon_atlas.py SpectrumFederation/media/Icons/UI \\
+        --atlas SpectrumFederation/media/Textures/UIIcons.tga \\
+        --lua SpectrumFederation/modules/UIIconAtlas.lua
+"""
+
+import argparse
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import addon_media
+
+
+DEFAULT_ADDON_DIR = "SpectrumFederation"
+DEFAULT_PADDING = 1
+DEFAULT_MAX_SIZE = 1024
+MIN_SIZE = 8
+
+# TGA descriptor: 8 alpha bits, rows stored bottom-up (the most widely supported layout)
+ATLAS_DESCRIPTOR = 0x08
+TGA_TOP_DOWN = 0x20
+TGA_RIGHT_TO_LEFT = 0x10
+
+Icon = namedtuple("Icon", ["name", "width", "height", "pixels"])
+
+# Position of a padded icon in the atlas (x, y of the icon itself, excluding padding)
+Placement = namedtuple("Placement", ["icon", "x", "y"])
+
+
+def load_icon(path):
+    """
+    Load a TGA as top-down 32-bit BGRA rows.
+
+    Raises:
+        ValueError: If the file is not a supported TGA
+    """
+    tga = addon_media.read_tga(Path(path).read_bytes())
+    if tga.descriptor & TGA_RIGHT_TO_LEFT:
+        raise ValueError("right-to-left TGAs are not supported")
+
+    count = tga.width * tga.height
+    if tga.bits == 32:
+        pixels = bytearray(tga.pixels)
+    else:
+        pixels = bytearray(b"\xff" * (count * 4))
+        if tga.grayscale:
+            for channel in range(3):
+                pixels[channel::4] = tga.pixels
+        else:
+            for channel in range(3):
+                pixels[channel::4] = tga.pixels[channel::3]
+
+    row_size = tga.width * 4
+    rows = [bytes(pixels[i:i + row_size]) for i in range(0, len(pixels), row_size)]
+    if not tga.descriptor & TGA_TOP_DOWN:
+        rows.reverse()
+    return Icon(Path(path).stem, tga.width, tga.height, rows)
+
+
+def _pad(icon, padding):
+    """Return the icon's rows extended by `padding` copies of its edge pixels."""
+    rows = [row[:4] * padding + row + row[-4:] * padding for row in icon.pixels]
+    return [rows[0]] * padding + rows + [rows[-1]] * padding
+
+
+def _shelf_pack(icons, width, height, padding):
+    """Place icons (tallest first) on horizontal shelves; return placements or None if they do not fit."""
+    placements = []
+    x = y = shelf_height = 0
+    for icon in icons:
+        padded_width = icon.width + 2 * padding
+        padded_height = icon.height + 2 * padding
+        if x + padded_width > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if padded_width > width or y + padded_height > height:
+            return None
+        placements.append(Placement(icon, x + padding, y + padding))
+        x += padded_width
+        shelf_height = max(shelf_height, padded_height)
+    return placements
+
+
+def pack_icons(icons, padding=DEFAULT_PADDING, max_size=DEFAULT_MAX_SIZE):
+    """
+    Find the smallest power-of-two atlas the icons fit in.
+
+    Args:
+        icons: Icons to pack
+        padding: Edge pixels repeated around each icon
+        max_size: Largest allowed atlas side
+
+    Returns:
+        tuple: (width, height, placements)
+
+    Raises:
+        ValueError: If the icons do not fit in max_size x max_size
+    """
+    ordered = sorted(icons, key=lambda icon: (-icon.height, -icon.width, icon.name))
+    sizes = []
+    size = MIN_SIZE
+    while size <= max_size:
+        sizes.append(size)
+        size *= 2
+    # Smallest area first; prefer wide atlases, which fill shelves better
+    candidates = sorted(((w, h) for w in sizes for h in sizes if h <= w), key=lambda s: (s[0] * s[1], -s[0]))
+    for width, height in candidates:
+        placements = _shelf_pack(ordered, width, height, padding)
+        if placements is not None:
+            return width, height, placements
+    raise ValueError(f"icons do not fit in a {max_size}x{max_size} atlas")
+
+
+def render_atlas(width, height, placements, padding=DEFAULT_PADDING):
+    """Return the atlas as TGA bytes (32-bit, transparent background)."""
+    canvas = [bytearray(width * 4) for _ in range(height)]
+    for placement in placements:
+        left = (placement.x - padding) * 4
+        for offset, row in enumerate(_pad(placement.icon, padding)):
+            canvas[placement.y - padding + offset][left:left + len(row)] = row
+    canvas.reverse()  # bottom-up, per ATLAS_DESCRIPTOR
+    tga = addon_media.Tga(width, height, 32, False, False, ATLAS_DESCRIPTOR, b"".join(canvas))
+    return addon_media.encode_tga(tga, rle=False)
+
+
+def _format_coord(value):
+    return f"{value:.10g}"
+
+
+def render_lua(texture_path, width, height, placements):
+    """Return the Lua source of the texture-coordinate table."""
+    lines = [
+        "-- Generated by .github/scripts/icon_atlas.py; do not edit.",
+        "-- Grab the namespace",
+        "local addonName, SF = ...",
+        "",
+        "SF.IconAtlas = {",
+        f"    texture = \"{texture_path}\",",
+        f"    width = {width},",
+        f"    height = {height},",
+        "    -- name = { left, right, top, bottom } for Texture:SetTexCoord",
+        "    icons = {"
+    ]
+    for placement in sorted(placements, key=lambda p: p.icon.name):
+        icon = placement.icon
+        coords = ", ".join(_format_coord(v) for v in (
+            placement.x / width,
+            (placement.x + icon.width) / width,
+            placement.y / height,
+            (placement.y + icon.height) / height
+        ))
+        lines.append(f"        [\"{icon.name}\"] = {{ {coords} }},")
+    lines += [
+        "    },",
+        "}",
+        "",
+        "-- Point a texture at one icon of the atlas",
+        "-- @param texture: Texture region (e.g., button:GetNormalTexture())",
+        "-- @param name: Icon name (source file name without extension)",
+        "-- @return: true if the icon exists",
+        "function SF:SetIconTexture(texture, name)",
+        "    local coords = SF.IconAtlas.icons[name]",
+        "    if not coords then",
+        "        return false",
+        "    end",
+        "    texture:SetTexture(SF.IconAtlas.texture)",
+        "    texture:SetTexCoord(coords[1], coords[2], coords[3], coords[4])",
+        "    return true",
+        "end",
+        ""
+    ]
+    return "\n".join(lines)
+
+
+def game_path(path, addon_dir):
+    """Return the in-game path of a file in the addon, without extension, escaped for a Lua string."""
+    relative = Path(path).with_suffix("").resolve().relative_to(Path(addon_dir).resolve())
+    return "\\\\".join(["Interface", "AddOns", Path(addon_dir).resolve().name, *relative.parts])
+
+
+def _write_if_changed(path, content, check):
+    """Write content unless identical; in check mode only report. Returns True if it was up to date."""
+    path = Path(path)
+    if path.exists() and path.read_bytes() == content:
+        return True
+    if check:
+        print(f"::error file={path}::{path} is out of date; run icon_atlas.py")
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    print(f"[icon-atlas] ✓ Wrote {path}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack UI icons into one atlas TGA with a Lua texture-coordinate table"
+    )
+    parser.add_argument("source_dir", help="Directory of icon .tga files")
+    parser.add_argument("--atlas", required=True, help="Output atlas .tga (inside the addon directory)")
+    parser.add_argument("--lua", required=True, help="Output Lua file (inside the addon directory)")
+    parser.add_argument("--addon-dir", default=DEFAULT_ADDON_DIR,
+                        help=f"Addon directory (default: {DEFAULT_ADDON_DIR})")
+    parser.add_argument("--padding", type=int, default=DEFAULT_PADDING,
+                        help=f"Edge pixels repeated around each icon (default: {DEFAULT_PADDING})")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE,
+                        help=f"Largest atlas side in pixels (default: {DEFAULT_MAX_SIZE})")
+    parser.add_argument("--check", action="store_true", help="Fail if the outputs are out of date")
+
+    args = parser.parse_args()
+
+    sources = sorted(Path(args.source_dir).glob("*.tga"), key=lambda p: p.name.lower())
+    if not sources:
+        print(f"::error ::No .tga icons found in {args.source_dir}")
+        return 1
+
+    icons = []
+    names = set()
+    for path in sources:
+        try:
+            icon = load_icon(path)
+        except (OSError, ValueError) as e:
+            print(f"::error file={path}::{e}")
+            return 1
+        if icon.name in names:
+            print(f"::error file={path}::Duplicate icon name '{icon.name}'")
+            return 1
+        names.add(icon.name)
+        icons.append(icon)
+
+    try:
+        width, height, placements = pack_icons(icons, args.padding, args.max_size)
+        texture_path = game_path(args.atlas, args.addon_dir)
+    except ValueError as e:
+        print(f"::error ::{e}")
+        return 1
+
+    print(f"[icon-atlas] Packed {len(icons)} icons into {width}x{height}")
+    atlas_ok = _write_if_changed(args.atlas, render_atlas(width, height, placements, args.padding), args.check)
+    lua = render_lua(texture_path, width, height, placements).encode("utf-8")
+    lua_ok = _write_if_changed(args.lua, lua, args.check)
+
+    toc = Path(args.addon_dir) / f"{Path(args.addon_dir).resolve().name}.toc"
+    toc_entry = Path(args.lua).resolve().relative_to(Path(args.addon_dir).resolve()).as_posix()
+    if toc.exists() and toc_entry.lower() not in toc.read_text(encoding="utf-8").lower().replace("\\", "/"):
+        print(f"[icon-atlas] Note: add '{toc_entry}' to {toc} (before the files that use SF:SetIconTexture)")
+
+    return 0 if atlas_ok and lua_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
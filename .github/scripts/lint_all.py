@@ -4,69 +4,566 @@ Unified linter for SpectrumFederation CI/CD.
 
 Runs all code quality checks:
 - luacheck for Lua files
-- yamllint for YAML files
+- yamllint for YAML files (in-process, plus GitHub Actions structural checks)
 - ruff for Python files
+
+The linters run concurrently; each tool's output is buffered and printed as
+one section when it finishes, so logs never interleave.
+
+With --since <ref>, only files changed since the merge base with <ref> are
+linted (a linter with no changed files is skipped). A change to a linter's
+config, or to this script, forces a full run of the affected linters.
+
+Per-file results are cached in .cache/lint, keyed by file content, tool
+version and tool configuration (see lint_cache.py). Only cache misses are
+linted; cached findings are replayed in the tool's own output format.
+
+--jsonl and --sarif write machine-readable reports (one record per finding,
+per file and per tool, with per-tool durations; per-file durations only
+where they are measured, i.e. the in-process YAML checks); in GitHub Actions every finding is
+also printed as an ::error/::warning file=... annotation.
+
+--watch keeps running after the first pass and relints only the files that
+change (inotify on Linux, polling elsewhere), reusing warm state: the
+in-process yamllint config, tool versions, config hashes and the cache.
 """
 
 import argparse
+import contextlib
+import functools
+import io
+import os
+import re
 import subprocess
 import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import workflow_lint
+from lint_cache import DEFAULT_CACHE_DIR, LintCache, config_hash, hash_file, tool_version
+from lint_report import Finding, LintReport, ToolResult, format_annotation
+from lint_watch import create_watcher
 
-def run_command(cmd, description):
-    """Run a command and return success status."""
-    print(f"\n[lint] Running {description}...")
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print(result.stderr, file=sys.stderr)
-        
-        if result.returncode != 0:
-            print(f"[lint] ✗ {description} failed with exit code {result.returncode}")
-            return False
+
+YAML_CONFIG = workflow_lint.YAML_CONFIG
+
+# Every linter uses a one-line-per-finding format starting with "<path>:",
+# so findings can be attributed to files, cached, and replayed verbatim.
+Linter = namedtuple(
+    "Linter",
+    [
+        "description",       # Human-readable tool name for log lines
+        "command",           # Command line without paths
+        "version_command",   # Prints the tool version, or callable returning it (part of the cache key)
+        "settings_command",  # Optional: prints resolved settings for a file (part of the cache key)
+        "suffixes",          # File suffixes the tool checks
+        "configs",           # Config files; a change forces a full run and a new cache key
+        "error_marker",      # Substring marking a finding as an error ("" = every finding)
+        "ok_codes",          # Exit codes of a completed run (with or without findings)
+        "finding_pattern",   # Regex with path/line/column and optional level/rule/message groups
+        "shardable",         # Files can be split across parallel processes (exit codes merge by max)
+        "run_in_process"     # Optional: callable(files, file_seconds) -> (exit_code, stdout, stderr)
+                             # replacing `command`; fills file_seconds with {path: seconds} per file
+    ],
+    defaults=(False, None)
+)
+
+# Never start a shard process for fewer files than this
+MIN_SHARD_FILES = 2
+
+LINTERS = {
+    "Lua": Linter(
+        "luacheck (Lua linter)",
+        ["luacheck", "--formatter", "plain", "--codes", "--only", "0"],
+        ["luacheck", "--version"],
+        None,
+        (".lua",),
+        (".luacheckrc",),
+        ": (E",
+        (0, 1, 2),
+        re.compile(r"^(?P<path>[^:]+):(?P<line>\d+):(?P<column>\d+)(?:-\d+)?: \((?P<rule>[EW]\d+)\) (?P<message>.*)$"),
+        shardable=True
+    ),
+    # yamllint runs in-process via its API, followed by GitHub Actions structural checks
+    "YAML": Linter(
+        "yamllint + workflow checks (YAML linter)",
+        ["yamllint", "-f", "parsable", "-d", YAML_CONFIG],
+        workflow_lint.checker_version,
+        None,
+        (".yml", ".yaml"),
+        (".yamllint", ".yamllint.yml", ".yamllint.yaml", "workflow_lint.py"),
+        ": [error]",
+        (0, 1),
+        re.compile(r"^(?P<path>[^:]+):(?P<line>\d+):(?P<column>\d+): \[(?P<level>\w+)\] "
+                   r"(?P<message>.*?)(?: \((?P<rule>[\w-]+)\))?$"),
+        run_in_process=lambda files, file_seconds: workflow_lint.lint_files(files, YAML_CONFIG, file_seconds)
+    ),
+    "Python": Linter(
+        "ruff (Python linter)",
+        ["ruff", "check", "--quiet", "--output-format", "concise", "--force-exclude"],
+        ["ruff", "--version"],
+        ["ruff", "check", "--show-settings"],
+        (".py",),
+        ("ruff.toml", ".ruff.toml", "pyproject.toml"),
+        "",
+        (0, 1),
+        re.compile(r"^(?P<path>[^:]+):(?P<line>\d+):(?P<column>\d+): (?:(?P<rule>[A-Z]+\d+) )?"
+                   r"(?:\[\*\] )?(?P<message>.*)$")
+    )
+}
+
+
+def expand_paths(paths, suffixes):
+    """Expand files and directories into a sorted list of files with matching suffixes."""
+    files = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.update(p for p in path.rglob("*") if p.suffix in suffixes and p.is_file())
+        elif path.suffix in suffixes and path.is_file():
+            files.add(path)
+    return sorted(str(path) for path in files)
+
+
+# Memoized per process so `--watch` relints skip the version and settings subprocesses
+_versions = {}
+_config_digests = {}
+
+
+def _tool_version(linter):
+    """Return the linter's version string, or None if it is not available."""
+    tool = linter.command[0]
+    if tool not in _versions:
+        if callable(linter.version_command):
+            try:
+                _versions[tool] = linter.version_command()
+            except ImportError:
+                _versions[tool] = None
+        else:
+            _versions[tool] = tool_version(linter.version_command)
+    return _versions[tool]
+
+
+def _config_digest(linter, probe_file):
+    """Return the linter's config hash, recomputed only when a config file changes."""
+    memo_key = (linter.command[0], tuple(
+        (config, os.stat(config).st_mtime_ns) for config in linter.configs if os.path.isfile(config)
+    ))
+    if memo_key not in _config_digests:
+        settings_command = linter.settings_command + [probe_file] if linter.settings_command else None
+        _config_digests[memo_key] = config_hash(linter.command, linter.configs, settings_command)
+    return _config_digests[memo_key]
+
+
+def _cache_keys(linter, files, version):
+    """Return {file: cache key}, or {} if the tool version is unknown."""
+    if version is None:
+        return {}
+    digest = _config_digest(linter, files[0])
+    return {
+        path: LintCache.key(linter.command[0], version, digest, path, hash_file(path))
+        for path in files
+    }
+
+
+def plan_shards(files, shards, timings=None):
+    """
+    Split files into balanced shards (greedy, heaviest file first).
+    
+    A file weighs its seconds from the timings cache when known (see
+    _file_timings); other files are weighted by size, scaled by the
+    seconds-per-byte of the timed files.
+    
+    Args:
+        files: Paths to split
+        shards: Maximum number of shards
+        timings: Optional {path: seconds} from previous runs
+    
+    Returns:
+        list: Non-empty lists of paths, each sorted
+    """
+    timings = timings or {}
+    sizes = {path: max(os.path.getsize(path), 1) for path in files}
+    timed = [path for path in files if path in timings]
+    rate = sum(timings[p] for p in timed) / sum(sizes[p] for p in timed) if timed else 1.0
+    weights = {path: timings.get(path, sizes[path] * rate) for path in files}
+    
+    bins = [[0.0, []] for _ in range(max(1, min(shards, len(files) // MIN_SHARD_FILES)))]
+    for path in sorted(files, key=lambda p: (-weights[p], p)):
+        lightest = min(bins, key=lambda b: b[0])
+        lightest[0] += weights[path]
+        lightest[1].append(path)
+    return [sorted(paths) for _, paths in bins if paths]
+
+
+def _file_timings(shard_seconds, measured, previous):
+    """
+    Update the timings cache from one run: {path: seconds}.
+    
+    A file's seconds are measured directly by an in-process linter, else its
+    shard's measured run time divided by the shard's file count. Each value is
+    averaged with the previous run's, so as shards mix differently across runs
+    a slow file's estimate moves towards its real share of the time.
+    
+    Args:
+        shard_seconds: [(paths, seconds)] measured per shard
+        measured: {path: seconds} measured per file (may be empty)
+        previous: {path: seconds} from the timings cache
+    """
+    timings = dict(previous)
+    for paths, seconds in shard_seconds:
+        for path in paths:
+            current = measured.get(path, seconds / len(paths))
+            timings[path] = (previous[path] + current) / 2 if path in previous else current
+    return timings
+
+
+def _run_shards(linter, shards):
+    """
+    Run one process per shard concurrently and merge them into one result.
+    
+    Returns:
+        tuple: (CompletedProcess with concatenated output and the highest
+        exit code, {path: seconds} measured per file by an in-process linter
+        (empty for a subprocess), [(paths, seconds)] per shard)
+    """
+    def run(paths):
+        start = time.monotonic()
+        file_seconds = {}
+        if linter.run_in_process:
+            result = subprocess.CompletedProcess(paths, *linter.run_in_process(paths, file_seconds))
+        else:
+            result = subprocess.run(linter.command + paths, capture_output=True, text=True, check=False)
+        return paths, result, time.monotonic() - start, file_seconds
+    
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        runs = list(executor.map(run, shards))
+    
+    measured = {}
+    for _, _, _, file_seconds in runs:
+        measured.update(file_seconds)
+    
+    merged = subprocess.CompletedProcess(
+        [path for paths, *_ in runs for path in paths],
+        max(result.returncode for _, result, *_ in runs),
+        "".join(result.stdout for _, result, *_ in runs),
+        "".join(result.stderr for _, result, *_ in runs)
+    )
+    return merged, measured, [(paths, seconds) for paths, _, seconds, _ in runs]
+
+
+def parse_finding(linter, line, cached=False):
+    """Parse one output line of a linter into a Finding."""
+    level = "error" if linter.error_marker in line else "warning"
+    match = linter.finding_pattern.match(line)
+    if match is None:
+        return Finding(linter.command[0], line.split(":", 1)[0], None, None, level, None, line, cached)
+    groups = match.groupdict()
+    return Finding(
+        linter.command[0],
+        groups["path"],
+        int(groups["line"]),
+        int(groups["column"]),
+        level,
+        groups.get("rule"),
+        groups.get("message") or line,
+        cached
+    )
+
+
+def run_linter(linter, paths, out=None, cache=None, shards=1, report=None, annotations=False):
+    """
+    Run a linter and return success status.
+    
+    With a cache, files whose findings are cached (same content, tool version
+    and config) are not re-linted; their findings are replayed in the tool's
+    output format. Only a run that completed normally is written to the cache.
+    
+    Args:
+        linter: Linter describing the tool
+        paths: Files and directories to lint
+        out: Text stream for all output (default: stdout)
+        cache: Optional LintCache
+        shards: Parallel processes for a shardable linter (default: 1)
+        report: Optional LintReport receiving findings and measured per-file durations
+        annotations: Also print GitHub Actions ::error/::warning annotations
+    """
+    out = out or sys.stdout
+    start = time.monotonic()
+    print(f"\n[lint] Running {linter.description}...", file=out)
+    
+    files = expand_paths(paths, linter.suffixes)
+    version = _tool_version(linter) if (cache or report) and files else None
+    keys = _cache_keys(linter, files, version) if cache else {}
+    findings = {}
+    for path, key in keys.items():
+        cached = cache.load(key)
+        if cached is not None:
+            findings[path] = cached
+    cached_files = set(findings)
+    
+    def finish(passed, message):
+        print(f"[lint] {'✓' if passed else '✗'} {linter.description} {message}", file=out)
+        if report:
+            report.write_tool(ToolResult(
+                linter.command[0], version, passed, time.monotonic() - start, parsed,
+                files, file_seconds, cached_files
+            ))
+        return passed
+    
+    parsed = []
+    file_seconds = {}
+    if not files:
+        return finish(True, "had no files to check")
+    
+    misses = [path for path in files if path not in findings]
+    completed = True
+    extra_output = ""
+    if misses:
+        timings = cache.load_timings(linter.command[0]) if cache else {}
+        plan = plan_shards(misses, shards, timings) if linter.shardable and shards > 1 else [misses]
+        if len(plan) > 1:
+            print(f"[lint] Checking {len(misses)} file(s) in {len(plan)} shard(s)", file=out)
+        try:
+            result, file_seconds, shard_seconds = _run_shards(linter, plan)
+        except (FileNotFoundError, ImportError):
+            return finish(False, "tool not found")
+        except Exception as e:
+            return finish(False, f"error: {e}")
+        if cache and linter.shardable:
+            cache.store_timings(linter.command[0], _file_timings(shard_seconds, file_seconds, timings))
         
-        print(f"[lint] ✓ {description} passed")
-        return True
+        fresh = {path: [] for path in misses}
+        unattributed = []
+        for line in result.stdout.splitlines():
+            path = line.split(":", 1)[0]
+            if path in fresh:
+                fresh[path].append(line)
+            elif line.strip():
+                unattributed.append(line)
+        findings.update(fresh)
+        extra_output = "\n".join(unattributed + [result.stderr]).strip()
         
-    except FileNotFoundError:
-        print(f"[lint] ✗ {description} tool not found")
-        return False
-    except Exception as e:
-        print(f"[lint] ✗ {description} error: {e}")
-        return False
+        completed = result.returncode in linter.ok_codes
+        # Output outside per-file findings means this run can't be trusted for caching
+        if completed and keys and not extra_output:
+            for path in misses:
+                cache.store(keys[path], fresh[path])
+    
+    lines = [line for path in files for line in findings[path]]
+    parsed = [parse_finding(linter, line, line.split(":", 1)[0] in cached_files) for line in lines]
+    if lines:
+        print("\n".join(lines), file=out)
+    if extra_output:
+        print(extra_output, file=out)
+    if annotations:
+        for finding in parsed:
+            print(format_annotation(finding), file=out)
+    if cache:
+        print(f"[lint] {len(files) - len(misses)} of {len(files)} file(s) replayed from cache", file=out)
+    if file_seconds:
+        slowest = sorted(file_seconds.items(), key=lambda item: -item[1])[:3]
+        print("[lint] Slowest: " + ", ".join(f"{path} {seconds:.2f}s" for path, seconds in slowest), file=out)
+    
+    if not completed:
+        return finish(False, f"failed with exit code {result.returncode}")
+    
+    errors = sum(1 for finding in parsed if finding.level == "error")
+    if errors:
+        return finish(False, f"reported {errors} error(s)")
+    return finish(True, "passed")
 
 
-def lint_lua(addon_dir):
-    """Run luacheck on Lua files."""
-    return run_command(
-        ["luacheck", addon_dir, "--only", "0"],
-        "luacheck (Lua linter)"
-    )
+def lint_lua(paths, out=None, **options):
+    """Run luacheck on Lua files; `shards` splits them across parallel processes."""
+    return run_linter(LINTERS["Lua"], paths, out, **options)
 
 
-def lint_yaml(workflow_dir):
+def lint_yaml(paths, out=None, **options):
     """Run yamllint on GitHub workflow files."""
-    return run_command(
-        ["yamllint", "-d", "{extends: relaxed, rules: {line-length: disable}}", workflow_dir],
-        "yamllint (YAML linter)"
-    )
+    return run_linter(LINTERS["YAML"], paths, out, **options)
 
 
-def lint_python(ci_scripts_dir):
+def lint_python(paths, out=None, **options):
     """Run ruff on Python files."""
-    return run_command(
-        ["ruff", "check", ci_scripts_dir],
-        "ruff (Python linter)"
-    )
+    return run_linter(LINTERS["Python"], paths, out, **options)
+
+
+def _git(*args):
+    result = subprocess.run(["git", *args], capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def changed_files(base_ref):
+    """
+    List files added, copied, modified or renamed since the merge base with base_ref.
+    
+    Includes uncommitted changes in the working tree; deleted files are omitted.
+    
+    Args:
+        base_ref: Git ref to compare against (e.g., origin/beta)
+    
+    Returns:
+        list: Absolute Paths of changed files
+    
+    Raises:
+        RuntimeError: If git fails (unknown ref, shallow clone without the base, ...)
+    """
+    top = Path(_git("rev-parse", "--show-toplevel").strip())
+    merge_base = _git("merge-base", base_ref, "HEAD").strip()
+    names = _git("diff", "--name-only", "--diff-filter=ACMR", merge_base).splitlines()
+    return [top / name for name in names if name]
+
+
+def select_targets(name, root, changed):
+    """
+    Pick the paths one linter should check given the changed files.
+    
+    Args:
+        name: Linter name (key of LINTERS)
+        root: Directory the linter covers on a full run
+        changed: Changed files from changed_files(), or None for a full run
+    
+    Returns:
+        list: Paths to lint ([root] for a full run, [] if nothing relevant changed)
+    """
+    if changed is None:
+        return [root]
+    
+    linter = LINTERS[name]
+    if any(path.name in linter.configs or path.name == Path(__file__).name for path in changed):
+        return [root]
+    
+    root_path = Path(root).resolve()
+    return [
+        os.path.relpath(path)
+        for path in changed
+        if path.suffix in linter.suffixes and root_path in path.resolve().parents
+    ]
+
+
+def _run_buffered(name, linter, targets, options):
+    """Run one linter into a private buffer; return (name, passed, seconds, output)."""
+    buffer = io.StringIO()
+    start = time.monotonic()
+    passed = linter(targets, out=buffer, **options)
+    return name, passed, time.monotonic() - start, buffer.getvalue()
+
+
+def run_linters(jobs, max_workers=None, **options):
+    """
+    Run linters concurrently and print each tool's output as one section.
+    
+    Args:
+        jobs: List of (name, linter_function, paths) tuples
+        max_workers: Worker pool size (default: one per linter)
+        options: Passed to every linter (cache, report, annotations)
+    
+    Returns:
+        dict: {name: (passed, seconds)}
+    """
+    results = {}
+    if not jobs:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max_workers or len(jobs)) as executor:
+        futures = [executor.submit(_run_buffered, name, linter, paths, options) for name, linter, paths in jobs]
+        for future in as_completed(futures):
+            name, passed, seconds, output = future.result()
+            print(f"\n{'-' * 70}\n[lint] {name} ({seconds:.2f}s)\n{'-' * 70}", end="")
+            print(output, end="", flush=True)
+            results[name] = (passed, seconds)
+    
+    return results
+
+
+def plan_jobs(linters, changed):
+    """
+    Match changed files to linters.
+    
+    Args:
+        linters: List of (name, linter_function, root) tuples
+        changed: Changed files, or None for a full run
+    
+    Returns:
+        tuple: (jobs for run_linters, names of linters with nothing to check)
+    """
+    jobs = []
+    unchanged = []
+    for name, linter, root in linters:
+        targets = select_targets(name, root, changed)
+        if targets:
+            jobs.append((name, linter, targets))
+        else:
+            unchanged.append(name)
+    return jobs, unchanged
+
+
+def print_summary(linters, results, unchanged, wall_time):
+    """Print the per-linter summary table and return the exit code."""
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    
+    all_passed = all(passed for passed, _ in results.values())
+    
+    for name, _, _ in linters:
+        if name in unchanged:
+            print(f"{name:10} - SKIPPED  (no changed files)")
+            continue
+        passed, seconds = results[name]
+        status = "✓ PASSED" if passed else "✗ FAILED"
+        print(f"{name:10} {status}  {seconds:6.2f}s")
+    
+    print(f"{'Total':10} {'':8}  {wall_time:6.2f}s wall")
+    
+    if all_passed:
+        print("\n✓ All linters passed")
+        return 0
+    else:
+        print("\n✗ Some linters failed")
+        return 1
+
+
+def watch_and_lint(linters, max_workers, cache, debounce):
+    """
+    Relint touched files whenever the linted directories change, until Ctrl+C.
+    
+    Each burst of saves (debounced) is matched to linters like a --since
+    run: only changed files are relinted, and a config change relints the
+    whole tree. Watching also covers the repository root, where the linter
+    configs live.
+    """
+    watcher = create_watcher([root for _, _, root in linters], flat_dirs=["."])
+    print(f"\n[lint] Watching {', '.join(root for _, _, root in linters)} for changes (Ctrl+C to stop)",
+          flush=True)
+    try:
+        while True:
+            batch = watcher.next_batch(debounce)
+            # A directory means the watcher lost events; relint everything
+            changed = None if any(path.is_dir() for path in batch) else [
+                path.resolve() for path in batch if path.is_file()
+            ]
+            if changed == []:
+                continue
+            jobs, unchanged = plan_jobs(linters, changed)
+            if not jobs:
+                continue
+            
+            start = time.monotonic()
+            label = "Full relint" if changed is None else f"{len(changed)} file(s) changed"
+            print(f"\n{'=' * 70}\n[lint] {label} at {time.strftime('%H:%M:%S')}\n{'=' * 70}")
+            results = run_linters(jobs, max_workers, cache=cache)
+            print_summary(linters, results, unchanged, time.monotonic() - start)
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        print("\n[lint] Stopped watching")
+        return 0
+    finally:
+        watcher.close()
 
 
 def main():
@@ -103,6 +600,59 @@ def main():
         action="store_true",
         help="Skip Python linting"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Maximum linters to run at once (default: all at once)"
+    )
+    parser.add_argument(
+        "--lua-shards",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel luacheck processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--since",
+        metavar="REF",
+        help="Only lint files changed since the merge base with REF (e.g., origin/beta)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Per-file lint result cache (default: $LINT_CACHE_DIR or {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Lint every file without reading or writing the result cache"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After the first run, relint touched files on every change until Ctrl+C"
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.1,
+        help="Seconds without file events before a watch relint starts (default: 0.1)"
+    )
+    parser.add_argument(
+        "--jsonl",
+        metavar="FILE",
+        help="Write findings, per-file and per-tool durations as JSON Lines"
+    )
+    parser.add_argument(
+        "--sarif",
+        metavar="FILE",
+        help="Write findings as a SARIF 2.1.0 report"
+    )
+    parser.add_argument(
+        "--annotations",
+        choices=["auto", "always", "never"],
+        default="auto",
+        help="Print GitHub ::error file=... annotations (default: auto, when running in GitHub Actions)"
+    )
     
     args = parser.parse_args()
     
@@ -123,35 +673,40 @@ def main():
     print("SpectrumFederation - Unified Linter")
     print("=" * 70)
     
-    results = []
+    changed = None
+    if args.since:
+        try:
+            changed = changed_files(args.since)
+            print(f"[lint] {len(changed)} file(s) changed since {args.since}")
+        except RuntimeError as e:
+            print(f"::warning ::Could not diff against {args.since} ({e}); linting everything")
     
-    # Run linters
+    linters = []
     if not args.skip_lua:
-        results.append(("Lua", lint_lua(args.addon_dir)))
+        linters.append(("Lua", functools.partial(lint_lua, shards=args.lua_shards), args.addon_dir))
     
     if not args.skip_yaml:
-        results.append(("YAML", lint_yaml(args.workflow_dir)))
+        linters.append(("YAML", lint_yaml, args.workflow_dir))
     
     if not args.skip_python:
-        results.append(("Python", lint_python(args.ci_scripts_dir)))
+        linters.append(("Python", lint_python, args.ci_scripts_dir))
     
-    # Summary
-    print("\n" + "=" * 70)
-    print("SUMMARY")
-    print("=" * 70)
-    
-    all_passed = all(result for _, result in results)
+    # Run linters
+    jobs, unchanged = plan_jobs(linters, changed)
     
-    for name, passed in results:
-        status = "✓ PASSED" if passed else "✗ FAILED"
-        print(f"{name:10} {status}")
+    start = time.monotonic()
+    cache = None if args.no_cache else LintCache(args.cache_dir)
+    annotations = args.annotations == "always" or (
+        args.annotations == "auto" and os.environ.get("GITHUB_ACTIONS") == "true"
+    )
+    report = LintReport(args.jsonl, args.sarif) if args.jsonl or args.sarif else None
+    with report or contextlib.nullcontext():
+        results = run_linters(jobs, args.jobs, cache=cache, report=report, annotations=annotations)
+    exit_code = print_summary(linters, results, unchanged, time.monotonic() - start)
     
-    if all_passed:
-        print("\n✓ All linters passed")
-        return 0
-    else:
-        print("\n✗ Some linters failed")
-        return 1
+    if args.watch:
+        return watch_and_lint(linters, args.jobs, cache, args.debounce)
+    return exit_code
 
 
 if __name__ == "__main__":
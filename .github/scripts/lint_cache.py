@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Persistent per-file cache of lint results.
+
+Each entry holds the findings one linter reported for one file, keyed by:
+- the linter name and version (`<tool> --version`)
+- a hash of its effective configuration (command line and config files)
+- the file's path and a SHA-256 of its content
+
+Any change to the file, the tool or its configuration therefore produces a
+new key, so entries never need invalidating; stale ones are simply unused.
+The directory can be kept between CI runs with actions/cache. It also keeps
+per-file run times, used to balance sharded linter runs.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+
+DEFAULT_CACHE_DIR = os.environ.get("LINT_CACHE_DIR", ".cache/lint")
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tool_version(version_command):
+    """Return the tool's version string, or None if it cannot be run."""
+    try:
+        result = subprocess.run(version_command, capture_output=True, text=True, check=False)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return (result.stdout + result.stderr).strip()
+
+
+def config_hash(command, config_files=(), settings_command=None):
+    """
+    Hash everything besides the file itself that affects a linter's findings.
+
+    Args:
+        command: Linter command line without paths (covers inline configs and flags)
+        config_files: Config file paths; missing files are skipped
+        settings_command: Optional command printing the tool's resolved settings
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256("\0".join(command).encode("utf-8"))
+    for config in config_files:
+        if os.path.isfile(config):
+            digest.update(f"\0{config}\0".encode())
+            with open(config, "rb") as f:
+                digest.update(f.read())
+    if settings_command:
+        try:
+            result = subprocess.run(settings_command, capture_output=True, check=False)
+        except OSError:
+            result = None
+        if result is not None:
+            # ruff names the probed file on the first line; the settings themselves are per project
+            lines = [line for line in result.stdout.splitlines() if not line.startswith(b"Resolved settings for")]
+            digest.update(b"\0" + b"\n".join(lines))
+    return digest.hexdigest()
+
+
+class LintCache:
+    """Directory of JSON entries, one per (tool, version, config, file content)."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key(tool, version, config_digest, path, content_digest):
+        return hashlib.sha256(
+            "\0".join([tool, version, config_digest, str(path), content_digest]).encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def load(self, key):
+        """Return the cached findings (list of output lines) for key, or None."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        return entry["findings"]
+
+    def store(self, key, findings):
+        self._write(self._path(key), {"key": key, "findings": findings})
+
+    def load_timings(self, tool):
+        """Return {path: seconds} averaged over previous runs of a tool (see lint_all._file_timings)."""
+        try:
+            with open(self.cache_dir / f"timings-{tool}.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def store_timings(self, tool, timings):
+        self._write(self.cache_dir / f"timings-{tool}.json", timings)
+
+    def _write(self, path, data):
+        """Write JSON atomically so concurrent runs never read a partial file."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[lint-cache] Warning: Could not write cache entry: {e}", file=sys.stderr)
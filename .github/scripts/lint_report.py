@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Machine-readable lint reports for lint_all.py.
+
+Writes one record per finding, per file and per tool as each linter
+finishes, so nothing accumulates in memory beyond the tool being written:
+- JSON Lines: `{"type": "finding" | "file" | "tool", ...}`, flushed per tool
+- SARIF 2.1.0: one run per tool, with durations in the run's invocation
+
+Per-file durations are only reported where a tool measures them (the
+in-process YAML checks); a file linted by a subprocess has `"seconds": null`.
+
+Also formats findings as GitHub Actions `::error file=...` annotations.
+"""
+
+import contextlib
+import json
+import os
+import threading
+from collections import namedtuple
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+Finding = namedtuple("Finding", ["tool", "path", "line", "column", "level", "rule", "message", "cached"])
+
+# Tool result passed to LintReport.write_tool; file_seconds holds only measured files
+ToolResult = namedtuple(
+    "ToolResult",
+    ["tool", "version", "passed", "seconds", "findings", "files", "file_seconds", "cached_files"]
+)
+
+
+def _escape_data(value):
+    return str(value).replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _escape_property(value):
+    return _escape_data(value).replace(":", "%3A").replace(",", "%2C")
+
+
+def format_annotation(finding):
+    """Format a finding as a GitHub Actions ::error/::warning workflow command."""
+    command = "error" if finding.level == "error" else "warning"
+    properties = [f"file={_escape_property(finding.path)}"]
+    if finding.line:
+        properties.append(f"line={finding.line}")
+    if finding.column:
+        properties.append(f"col={finding.column}")
+    title = f"{finding.tool} {finding.rule}" if finding.rule else finding.tool
+    properties.append(f"title={_escape_property(title)}")
+    return f"::{command} {','.join(properties)}::{_escape_data(finding.message)}"
+
+
+def _sarif_result(finding):
+    region = {}
+    if finding.line:
+        region["startLine"] = finding.line
+    if finding.column:
+        region["startColumn"] = finding.column
+    location = {"artifactLocation": {"uri": finding.path.replace(os.sep, "/")}}
+    if region:
+        location["region"] = region
+    result = {
+        "level": "error" if finding.level == "error" else "warning",
+        "message": {"text": finding.message},
+        "locations": [{"physicalLocation": location}]
+    }
+    if finding.rule:
+        result["ruleId"] = finding.rule
+    if finding.cached:
+        result["properties"] = {"cached": True}
+    return result
+
+
+class LintReport:
+    """
+    Streams tool results to JSON Lines and/or SARIF files.
+
+    Args:
+        jsonl_path: JSON Lines output path (None to skip)
+        sarif_path: SARIF output path (None to skip)
+    """
+
+    def __init__(self, jsonl_path=None, sarif_path=None):
+        self._lock = threading.Lock()
+        self._sarif_runs = 0
+        # Owns the output files; if opening either one fails, both are closed
+        with contextlib.ExitStack() as files:
+            self._jsonl = files.enter_context(open(jsonl_path, "w", encoding="utf-8")) if jsonl_path else None
+            self._sarif = files.enter_context(open(sarif_path, "w", encoding="utf-8")) if sarif_path else None
+            if self._sarif:
+                self._sarif.write(f'{{"$schema": "{SARIF_SCHEMA}", "version": "2.1.0", "runs": [')
+            self._files = files.pop_all()
+
+    def write_tool(self, result):
+        """Append one tool's findings, per-file records and summary to every output."""
+        with self._lock:
+            if self._jsonl:
+                self._write_jsonl(result)
+                self._jsonl.flush()
+            if self._sarif:
+                self._write_sarif_run(result)
+                self._sarif.flush()
+
+    def _write_jsonl(self, result):
+        for finding in result.findings:
+            self._jsonl.write(json.dumps({"type": "finding", **finding._asdict()}) + "\n")
+        counts = {}
+        for finding in result.findings:
+            counts[finding.path] = counts.get(finding.path, 0) + 1
+        for path in sorted(result.files):
+            seconds = result.file_seconds.get(path)
+            record = {
+                "type": "file",
+                "tool": result.tool,
+                "path": path,
+                "seconds": None if seconds is None else round(seconds, 6),
+                "cached": path in result.cached_files,
+                "findings": counts.get(path, 0)
+            }
+            self._jsonl.write(json.dumps(record) + "\n")
+        record = {
+            "type": "tool",
+            "tool": result.tool,
+            "version": result.version,
+            "passed": result.passed,
+            "seconds": round(result.seconds, 6),
+            "files": len(result.files),
+            "cached_files": len(result.cached_files),
+            "findings": len(result.findings)
+        }
+        self._jsonl.write(json.dumps(record) + "\n")
+
+    def _write_sarif_run(self, result):
+        rules = sorted({finding.rule for finding in result.findings if finding.rule})
+        driver = {"name": result.tool, "rules": [{"id": rule} for rule in rules]}
+        if result.version:
+            driver["version"] = result.version
+        invocation = {
+            "executionSuccessful": result.passed,
+            "properties": {"durationSeconds": round(result.seconds, 6)}
+        }
+        if result.file_seconds:
+            invocation["properties"]["fileDurationSeconds"] = {
+                path: round(s, 6) for path, s in sorted(result.file_seconds.items())
+            }
+
+        self._sarif.write(("," if self._sarif_runs else "") + '{"tool": ')
+        self._sarif.write(json.dumps({"driver": driver}))
+        self._sarif.write(', "invocations": ' + json.dumps([invocation]) + ', "results": [')
+        for index, finding in enumerate(result.findings):
+            self._sarif.write(("," if index else "") + json.dumps(_sarif_result(finding)))
+        self._sarif.write("]}")
+        self._sarif_runs += 1
+
+    def close(self):
+        """Finish the SARIF document and close both files (also if writing fails)."""
+        with self._lock, self._files:
+            if self._sarif:
+                self._sarif.write("]}\n")
+            self._jsonl = None
+            self._sarif = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+File change watching for `lint_all.py --watch`.
+
+On Linux, directories are watched with inotify (through ctypes, no extra
+dependencies); recursive trees get one watch per directory, and new
+subdirectories are picked up as they appear. Elsewhere, or if inotify is
+unavailable, a polling watcher compares file mtimes.
+
+Both watchers report changed files in bursts: `next_batch` blocks until a
+file is written, then keeps collecting until no event has arrived for the
+debounce window, so an editor's save-all becomes one relint.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+# Editors either rewrite a file in place (close-after-write) or write a
+# temporary file and rename it over the original (moved-to)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_HEADER = struct.Struct("iIII")
+
+IGNORED_DIRS = {".git", "__pycache__", ".cache", ".ruff_cache", "node_modules"}
+
+
+def _walk_dirs(root):
+    """Yield root and every subdirectory not in IGNORED_DIRS."""
+    yield root
+    for path in sorted(Path(root).iterdir()):
+        if path.is_dir() and path.name not in IGNORED_DIRS:
+            yield from _walk_dirs(path)
+
+
+class InotifyWatcher:
+    """
+    inotify-based watcher.
+
+    Args:
+        recursive_dirs: Directories watched with all their subdirectories
+        flat_dirs: Directories watched without subdirectories (e.g., the repo root for config files)
+
+    Raises:
+        OSError: If inotify is not available
+    """
+
+    def __init__(self, recursive_dirs, flat_dirs=()):
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._dirs = {}
+        self._recursive = set()
+        self.roots = [Path(d) for d in (*recursive_dirs, *flat_dirs)]
+        for directory in recursive_dirs:
+            for path in _walk_dirs(directory):
+                self._add(path, recursive=True)
+        for directory in flat_dirs:
+            self._add(Path(directory), recursive=False)
+
+    def _add(self, path, recursive):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            print(f"[lint-watch] Warning: cannot watch {path}: {os.strerror(ctypes.get_errno())}",
+                  file=sys.stderr)
+            return
+        self._dirs[wd] = Path(path)
+        if recursive:
+            self._recursive.add(wd)
+
+    def _read(self, timeout):
+        """
+        Wait up to timeout seconds for events and return the changed file paths.
+
+        Returns None if no event arrived, so callers can tell silence from
+        events that did not touch a file (e.g., a new empty directory).
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return None
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return None
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report the roots so everything is relinted
+                changed.update(self.roots)
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & IN_CREATE and wd in self._recursive and path.name not in IGNORED_DIRS:
+                    for subdirectory in _walk_dirs(path):
+                        self._add(subdirectory, recursive=True)
+                        # Files written before the watch existed produced no events
+                        changed.update(child for child in subdirectory.iterdir() if child.is_file())
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changed.add(path)
+        return changed
+
+    def next_batch(self, debounce=0.1, timeout=None):
+        """
+        Block until files change, then collect until quiet for `debounce` seconds.
+
+        Returns:
+            set: Changed Paths (empty if timeout passed without changes)
+        """
+        changed = self._read(timeout)
+        if changed is None:
+            return set()
+        while True:
+            more = self._read(debounce)
+            if more is None:
+                return changed
+            changed |= more
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Portable fallback that rescans file mtimes every `interval` seconds."""
+
+    def __init__(self, recursive_dirs, flat_dirs=(), interval=0.25):
+        self.recursive_dirs = [Path(d) for d in recursive_dirs]
+        self.flat_dirs = [Path(d) for d in flat_dirs]
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        files = {}
+        directories = [(d, True) for d in self.recursive_dirs] + [(d, False) for d in self.flat_dirs]
+        for root, recursive in directories:
+            for directory in (_walk_dirs(root) if recursive else [root]):
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _poll(self):
+        snapshot = self._scan()
+        changed = {path for path, state in snapshot.items() if self._snapshot.get(path) != state}
+        self._snapshot = snapshot
+        return changed
+
+    def next_batch(self, debounce=0.1, timeout=None):
+        """Same contract as InotifyWatcher.next_batch."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        while not changed:
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            time.sleep(self.interval)
+            changed = self._poll()
+        while True:
+            time.sleep(max(debounce, self.interval))
+            more = self._poll()
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self):
+        pass
+
+
+def create_watcher(recursive_dirs, flat_dirs=()):
+    """Return an InotifyWatcher when possible, otherwise a PollingWatcher."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(recursive_dirs, flat_dirs)
+        except (OSError, AttributeError) as e:
+            print(f"[lint-watch] inotify unavailable ({e}); polling for changes", file=sys.stderr)
+    return PollingWatcher(recursive_dirs, flat_dirs)
@@ -3,6 +3,12 @@
 Package addon and create GitHub release.
 
 Creates a zip file with proper structure and publishes to GitHub Releases.
+With --artifact, publishes the zip already built and validated by
+validate_packaging.py instead, after checking it against its manifest.
+
+Addons with a TOC per game flavor get one zip per flavor TOC
+(<addon>-<version>-<flavor>.zip), all built in one pass, and a single
+release.json listing every zip with the flavors it serves.
 """
 
 import argparse
@@ -13,6 +19,18 @@ import subprocess
 import sys
 from pathlib import Path
 
+from addon_packer import (
+    DEFAULT_BUILD_CACHE_DIR,
+    cached_addon_zips,
+    file_sha256,
+    package_outputs,
+    package_zip_path,
+    place_file,
+    tree_hash,
+    verify_artifact
+)
+from toc_model import MAINLINE, addon_packages
+
 
 def get_changelog_for_version(version):
     """Extract changelog content for a specific version from CHANGELOG.md.
@@ -74,14 +92,12 @@ def get_changelog_for_version(version):
         return None
 
 
-def create_release_json(version, interface, addon_name, zip_filename):
+def create_release_json(releases):
     """Create release.json for WowUp Hub compatibility.
     
     Args:
-        version: Version string (e.g., '0.0.19')
-        interface: WoW interface version (e.g., 110207)
-        addon_name: Name of the addon (e.g., 'SpectrumFederation')
-        zip_filename: Name of the zip file (e.g., 'SpectrumFederation-0.0.19.zip')
+        releases: List of (zip_filename, {flavor: interface}) pairs, one per zip
+            (e.g., [('SpectrumFederation-0.0.19.zip', {'mainline': 110207})])
         
     Returns:
         Path to the generated release.json file
@@ -98,11 +114,13 @@ def create_release_json(version, interface, addon_name, zip_filename):
                 "nolib": False,
                 "metadata": [
                     {
-                        "flavor": "mainline",
+                        "flavor": flavor,
                         "interface": int(interface)
                     }
+                    for flavor, interface in flavors.items()
                 ]
             }
+            for zip_filename, flavors in releases
         ]
     }
     
@@ -113,37 +131,99 @@ def create_release_json(version, interface, addon_name, zip_filename):
     return json_path
 
 
-def create_addon_zip(addon_name, version):
-    """Create addon zip file with proper structure."""
+def create_addon_zips(addon_name, version, packages, cache_dir=DEFAULT_BUILD_CACHE_DIR):
+    """Create one release zip per package in a single pass, reusing cached builds of the same tree.
+    
+    Returns:
+        List of zip paths in package order, or None on failure
+    """
     build_dir = Path("build")
     build_dir.mkdir(exist_ok=True)
     
-    zip_name = f"{addon_name}-{version}.zip"
-    zip_path = build_dir / zip_name
+    outputs = package_outputs(build_dir / f"{addon_name}-{version}.zip", packages)
     
-    # Remove old zip if exists
-    if zip_path.exists():
-        zip_path.unlink()
+    # Remove old zips if they exist
+    for zip_path in outputs:
+        if zip_path.exists():
+            zip_path.unlink()
     
-    print(f"[publish-release] Creating release zip: {zip_path}")
+    print(f"[publish-release] Creating release zip(s): {', '.join(str(p) for p in outputs)}")
     
-    # Create zip using subprocess for consistency with validation
+    # Same deterministic packer as validation, so both archives match
     try:
-        subprocess.run(
-            ["zip", "-r", str(zip_path), addon_name, "-x", "*.git*"],
-            check=True,
-            capture_output=True
-        )
-        print(f"[publish-release] ✓ Created {zip_path}")
-        return zip_path
-        
-    except subprocess.CalledProcessError as e:
+        results = cached_addon_zips(addon_name, outputs, cache_dir)
+    except OSError as e:
         print(f"::error ::Failed to create release zip: {e}")
         return None
+    
+    for zip_path, (names, hit) in results.items():
+        source = ", reused cached build" if hit else ""
+        print(f"[publish-release] ✓ Created {zip_path} ({len(names)} entries{source})")
+    return list(outputs)
 
 
-def create_github_release(version, zip_path, json_path, repo, is_prerelease=False, dry_run=False):
-    """Create GitHub release and upload assets using gh CLI."""
+def use_validated_artifacts(artifact, addon_name, version, packages):
+    """Stage the packages built and validated by validate_packaging.py as the release zips.
+    
+    Args:
+        artifact: Validated package zip (its manifest sits next to it); flavor
+            packages are found next to it (build/X.zip -> build/X-classic.zip)
+        addon_name: Name of the addon (e.g., 'SpectrumFederation')
+        version: Version string (e.g., '0.0.19')
+        packages: Result of toc_model.addon_packages
+        
+    Returns:
+        dict: {zip_path: sha256} of the release zips in package order, or None on failure
+    """
+    tree = tree_hash(addon_name)
+    staged = {}
+    for package in packages:
+        package_artifact = package_zip_path(artifact, package)
+        try:
+            manifest = verify_artifact(package_artifact)
+        except (OSError, ValueError) as e:
+            print(f"::error ::Package artifact check failed: {e}")
+            return None
+        
+        if not manifest.get("validated"):
+            print(f"::error ::Package '{package_artifact}' has not passed validate_packaging.py")
+            return None
+        
+        if manifest.get("tree") != tree:
+            print(f"::error ::Package '{package_artifact}' was built from a different {addon_name} tree")
+            print("          Re-run validate_packaging.py before publishing")
+            return None
+        
+        zip_path = package_zip_path(Path("build") / f"{addon_name}-{version}.zip", package)
+        if zip_path.exists():
+            zip_path.unlink()
+        
+        try:
+            # Same bytes as the validated package; re-checked against its sha256 before upload
+            place_file(package_artifact, zip_path, link=True)
+        except OSError as e:
+            print(f"::error ::Failed to stage release zip: {e}")
+            return None
+        
+        print(f"[publish-release] ✓ Using validated package {package_artifact} as {zip_path}")
+        staged[zip_path] = manifest["sha256"]
+    return staged
+
+
+def create_github_release(version, zip_paths, json_path, repo, is_prerelease=False, dry_run=False,
+                          expected_sha256=None):
+    """Create GitHub release and upload assets using gh CLI.
+    
+    If expected_sha256 ({zip_path: sha256}) is given, each zip is re-hashed
+    right before upload and the release is refused unless all still match.
+    """
+    for zip_path, sha256 in (expected_sha256 or {}).items():
+        actual_sha256 = file_sha256(zip_path)
+        if actual_sha256 != sha256:
+            print(f"::error ::{zip_path} changed after validation (sha256 {actual_sha256}, expected {sha256})")
+            return False
+        print(f"[publish-release] ✓ {zip_path} matches validated sha256 {sha256}")
+    
     github_token = os.environ.get("GITHUB_TOKEN")
     if not github_token:
         print("Error: GITHUB_TOKEN environment variable not set")
@@ -175,7 +255,7 @@ def create_github_release(version, zip_path, json_path, repo, is_prerelease=Fals
         print(f"  Tag: {tag_name}")
         print(f"  Name: {release_name}")
         print(f"  Prerelease: {is_prerelease}")
-        print(f"  Assets: {zip_path}, {json_path}")
+        print(f"  Assets: {', '.join(str(p) for p in [*zip_paths, json_path])}")
         print(f"  Notes: {notes}")
         return True
     
@@ -185,7 +265,7 @@ def create_github_release(version, zip_path, json_path, repo, is_prerelease=Fals
     cmd = [
         "gh", "release", "create",
         tag_name,
-        str(zip_path),
+        *(str(p) for p in zip_paths),
         str(json_path),
         "--title", release_name,
         "--notes", notes,
@@ -227,8 +307,7 @@ def main():
     parser.add_argument(
         "--interface",
         type=int,
-        required=True,
-        help="WoW interface version (e.g., 110207 for 11.2.7)"
+        help="Mainline WoW interface version (e.g., 110207 for 11.2.7; default: from the TOC)"
     )
     parser.add_argument(
         "--addon-name",
@@ -245,6 +324,20 @@ def main():
         action="store_true",
         help="Don't actually create release, just show what would be done"
     )
+    parser.add_argument(
+        "--artifact",
+        help="Publish this zip built by validate_packaging.py (e.g., build/SpectrumFederation.zip) instead of building one"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_BUILD_CACHE_DIR,
+        help=f"Build cache directory (default: {DEFAULT_BUILD_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always rebuild the zip instead of reusing a cached build"
+    )
     
     args = parser.parse_args()
     
@@ -253,33 +346,55 @@ def main():
     
     print("[publish-release] Starting release process...")
     print(f"[publish-release] Version: {args.version}")
-    print(f"[publish-release] Interface: {args.interface}")
+    print(f"[publish-release] Interface: {args.interface or 'from TOC'}")
     print(f"[publish-release] Prerelease: {is_prerelease}")
     
-    # Construct zip filename
-    zip_filename = f"{args.addon_name}-{args.version}.zip"
+    # One zip per TOC file; --interface overrides the TOC for mainline
+    try:
+        packages = addon_packages(args.addon_name)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"::error ::Failed to read TOC files: {e}")
+        sys.exit(1)
+    if not packages:
+        print(f"::error ::No TOC file found in '{args.addon_name}'")
+        sys.exit(1)
+    
+    releases = []
+    for package in packages:
+        flavors = dict(package.flavors)
+        if args.interface and MAINLINE in flavors:
+            flavors[MAINLINE] = args.interface
+        for flavor, interface in flavors.items():
+            if interface is None:
+                print(f"::error ::No interface version for flavor '{flavor}' in {package.toc.path}")
+                sys.exit(1)
+            print(f"[publish-release] {flavor}: interface {interface} ({package.toc.path})")
+        zip_filename = package_zip_path(f"{args.addon_name}-{args.version}.zip", package).name
+        releases.append((zip_filename, flavors))
     
     # Create release.json
-    json_path = create_release_json(
-        args.version,
-        args.interface,
-        args.addon_name,
-        zip_filename
-    )
+    json_path = create_release_json(releases)
     
-    # Create zip
-    zip_path = create_addon_zip(args.addon_name, args.version)
-    if not zip_path:
+    # Use the validated packages, or create the zips
+    if args.artifact:
+        expected_sha256 = use_validated_artifacts(args.artifact, args.addon_name, args.version, packages)
+        zip_paths = list(expected_sha256) if expected_sha256 else None
+    else:
+        zip_paths = create_addon_zips(args.addon_name, args.version, packages,
+                                      None if args.no_cache else args.cache_dir)
+        expected_sha256 = None
+    if not zip_paths:
         sys.exit(1)
     
     # Create GitHub release
     success = create_github_release(
         args.version,
-        zip_path,
+        zip_paths,
         json_path,
         args.repo,
         is_prerelease=is_prerelease,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        expected_sha256=expected_sha256
     )
     
     if not success:
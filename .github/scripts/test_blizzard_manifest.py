@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for blizzard_manifest header and row handling.
+
+Usage:
+    python3 test_blizzard_manifest.py
+    python3 -m pytest .github/scripts/test_blizzard_manifest.py
+"""
+
+import sys
+import unittest
+
+from blizzard_manifest import ManifestError, parse_manifest
+
+
+class HeaderTests(unittest.TestCase):
+
+    def test_duplicate_column_is_manifest_error(self):
+        with self.assertRaises(ManifestError):
+            parse_manifest(b"Region!STRING:0|Region!STRING:0\nus|eu\n")
+
+    def test_keyword_and_invalid_names_are_usable(self):
+        manifest = parse_manifest(b"class!STRING:0|1Region!STRING:0|BuildId!DEC:4\nus|eu|64978\n")
+        self.assertEqual([column.name for column in manifest.columns], ["class", "1Region", "BuildId"])
+        record = manifest.find("1Region", "eu")
+        self.assertEqual(record[manifest.column_index("class")], "us")
+        self.assertEqual(record.BuildId, 64978)
+
+    def test_missing_type_is_manifest_error(self):
+        with self.assertRaises(ManifestError):
+            parse_manifest(b"Region|BuildId!DEC:4\nus|1\n")
+
+
+class RowTests(unittest.TestCase):
+
+    def test_non_utf8_row_is_manifest_error(self):
+        manifest = parse_manifest(b"Region!STRING:0|BuildId!DEC:4\n## seqn = 1\n\xff|12\n")
+        with self.assertRaises(ManifestError):
+            list(manifest)
+        with self.assertRaises(ManifestError):
+            manifest.find("Region", "us")
+
+    def test_non_utf8_comment_is_manifest_error(self):
+        with self.assertRaises(ManifestError):
+            parse_manifest(b"## seqn = \xff\nRegion!STRING:0\nus\n")
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Cross-check the files a TOC loads against the addon tree and the package zip.
+
+Builds one index keyed by case-folded path, filled in a single pass over
+each source: TOC entries (plus Lua/XML pulled in by listed XML files), files
+on disk, and zip members. Each key then says where the path appears and
+how it is spelled there, so one pass over the index finds:
+- TOC entries with no file on disk (error)
+- TOC entries spelled differently from the file on disk (error); Windows
+  loads them, but case-sensitive filesystems do not
+- files on disk differing only in case (error)
+- TOC entries present on disk but missing from the zip, or spelled differently there (error)
+- Lua files on disk that nothing loads (error)
+- TOC entries listed more than once (warning)
+
+Directory listings are used rather than existence checks, so results are
+the same on case-insensitive and case-sensitive filesystems.
+
+Usage:
+    python3 toc_index.py SpectrumFederation
+    python3 toc_index.py SpectrumFederation --zip build/SpectrumFederation.zip
+"""
+
+import argparse
+import posixpath
+import re
+import sys
+import zipfile
+from collections import deque, namedtuple
+from pathlib import Path
+
+from addon_packer import iter_addon_files
+from toc_model import Toc, parse_toc
+
+
+# <Script file="..."/> and <Include file="..."/>, relative to the XML file
+XML_FILE_PATTERN = re.compile(r"<(?:Script|Include)\s[^>]*?\bfile\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+
+# path is relative to the addon directory: the listing TOC/XML file when line is set, else the file itself
+Problem = namedtuple("Problem", ["level", "path", "line", "message"])
+
+
+class IndexEntry:
+    """Where one case-folded path appears: TOC references, disk spellings, zip spellings."""
+
+    __slots__ = ("disk", "references", "zip")
+
+    def __init__(self):
+        self.references = []  # (source, line, spelling)
+        self.disk = []
+        self.zip = []
+
+
+def normalize(path):
+    """Return a TOC/XML path with '/' separators, '.' and '..' resolved, and no leading separator."""
+    return posixpath.normpath(re.sub(r"[\\/]+", "/", path.strip())).lstrip("/")
+
+
+def toc_entries(toc):
+    """
+    Yield the files listed in a parsed TOC.
+
+    Yields:
+        tuple: (line_number, relative_path)
+    """
+    for line_number, path in toc.files:
+        yield line_number, normalize(path)
+
+
+def xml_entries(addon_dir, xml_path):
+    """
+    Yield the files an XML file loads with <Script file>/<Include file>.
+
+    Yields:
+        tuple: (line_number, relative_path) with paths relative to the addon directory
+    """
+    base = Path(xml_path).parent.relative_to(addon_dir)
+    text = Path(xml_path).read_text(encoding="utf-8", errors="replace")
+    for match in XML_FILE_PATTERN.finditer(text):
+        line_number = text.count("\n", 0, match.start()) + 1
+        yield line_number, normalize(f"{base.as_posix()}/{match.group(1)}")
+
+
+class FileIndex:
+    """
+    Index of TOC entries, disk files and zip members keyed by case-folded path.
+
+    Args:
+        addon_dir: Addon directory
+        toc: Parsed TOC (toc_model.Toc)
+        disk_files: Paths relative to addon_dir ('/' separated) of files that would be packaged
+        zip_names: Zip member names relative to the addon folder, or None if there is no zip
+    """
+
+    def __init__(self, addon_dir, toc, disk_files, zip_names=None):
+        self.addon_dir = Path(addon_dir)
+        self.toc_name = Path(toc.path).name
+        self.has_zip = zip_names is not None
+        self.entries = {}
+
+        for path in disk_files:
+            self._entry(path).disk.append(path)
+        for path in zip_names or ():
+            self._entry(path).zip.append(path)
+
+        # TOC entries, then XML includes, breadth-first; each XML file is read once
+        pending = deque((self.toc_name, line, path) for line, path in toc_entries(toc))
+        seen_xml = set()
+        while pending:
+            source, line, path = pending.popleft()
+            entry = self._entry(path)
+            entry.references.append((source, line, path))
+            if path.lower().endswith(".xml") and len(entry.disk) == 1 and entry.disk[0] not in seen_xml:
+                seen_xml.add(entry.disk[0])
+                xml_path = self.addon_dir / entry.disk[0]
+                pending.extend((entry.disk[0], n, p) for n, p in xml_entries(self.addon_dir, xml_path))
+
+    def _entry(self, path):
+        key = path.casefold()
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = IndexEntry()
+        return entry
+
+    def unloaded(self):
+        """Return the Lua files on disk that nothing loads, in path order."""
+        return [
+            self.entries[key].disk[0] for key in sorted(self.entries)
+            if key.endswith(".lua") and self.entries[key].disk and not self.entries[key].references
+        ]
+
+    def problems(self, include_unloaded=True):
+        """
+        Return every Problem, ordered by file and line.
+
+        Args:
+            include_unloaded: Report unloaded Lua files; turn off when another
+                TOC (e.g., for another game flavor) may load them, and check
+                unloaded() across all TOCs instead
+        """
+        problems = []
+        if include_unloaded:
+            problems += [
+                Problem("error", path, None, f"not loaded by {self.toc_name} or any XML file it lists")
+                for path in self.unloaded()
+            ]
+        for key in sorted(self.entries):
+            entry = self.entries[key]
+
+            if len(entry.disk) > 1:
+                problems.append(Problem("error", entry.disk[0], None,
+                                        f"files differ only in case: {', '.join(sorted(entry.disk))}"))
+
+            if not entry.references:
+                continue
+
+            seen = set()
+            for source, line, spelling in entry.references:
+                if (source, spelling) in seen:
+                    problems.append(Problem("warning", source, line, f"'{spelling}' is listed more than once"))
+                    continue
+                seen.add((source, spelling))
+
+                if not entry.disk:
+                    problems.append(Problem("error", source, line, f"'{spelling}' is listed but not found"))
+                elif spelling not in entry.disk:
+                    problems.append(Problem("error", source, line,
+                                            f"'{spelling}' is listed but the file is '{entry.disk[0]}'; "
+                                            "it will not load on case-sensitive filesystems"))
+                if self.has_zip and spelling in entry.disk and spelling not in entry.zip:
+                    found = f" (zip has '{entry.zip[0]}')" if entry.zip else ""
+                    problems.append(Problem("error", source, line, f"'{spelling}' is listed but not in the zip{found}"))
+        return sorted(problems, key=lambda problem: (problem.path, problem.line or 0))
+
+
+def build_index(addon_dir, toc, zip_path=None):
+    """
+    Index an addon directory, its TOC and optionally its package zip.
+
+    Disk files are the ones the packer would include (same excludes).
+
+    Args:
+        addon_dir: Addon directory
+        toc: Parsed TOC (toc_model.Toc), or a TOC file path to parse
+        zip_path: Package zip, if any
+
+    Returns:
+        FileIndex
+    """
+    addon_dir = Path(addon_dir)
+    if not isinstance(toc, Toc):
+        toc = parse_toc(toc)
+    prefix = f"{addon_dir.resolve().name}/"
+    disk_files = [
+        archive_name[len(prefix):]
+        for archive_name, _, is_dir in iter_addon_files(addon_dir)
+        if not is_dir
+    ]
+    zip_names = None
+    if zip_path:
+        with zipfile.ZipFile(zip_path) as zf:
+            zip_names = [
+                name[len(prefix):] for name in zf.namelist()
+                if name.startswith(prefix) and not name.endswith("/")
+            ]
+    return FileIndex(addon_dir, toc, disk_files, zip_names)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check TOC entries against the addon tree and package zip"
+    )
+    parser.add_argument("addon_dir", help="Addon directory (e.g., SpectrumFederation)")
+    parser.add_argument("--toc", help="TOC file (default: <addon_dir>/<addon name>.toc)")
+    parser.add_argument("--zip", help="Package zip to check as well")
+
+    args = parser.parse_args()
+
+    addon_dir = Path(args.addon_dir)
+    toc_path = Path(args.toc) if args.toc else addon_dir / f"{addon_dir.resolve().name}.toc"
+    try:
+        index = build_index(addon_dir, toc_path, args.zip)
+    except (OSError, UnicodeDecodeError, zipfile.BadZipFile) as e:
+        print(f"::error ::{e}")
+        return 1
+
+    failed = False
+    for problem in index.problems():
+        location = f"file={addon_dir / problem.path}" + (f",line={problem.line}" if problem.line else "")
+        print(f"::{problem.level} {location}::{problem.message}")
+        failed = failed or problem.level == "error"
+
+    if not failed:
+        print(f"[toc-index] ✓ {toc_path.name} matches the addon files")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Shared parser for the addon's TOC file.
+
+Every CI script and workflow step reads the TOC through this module, so
+there is one set of parse rules:
+- `## Key: value` lines are directives; keys are matched case-insensitively,
+  and the first occurrence wins
+- other lines starting with `#` are comments
+- every other non-blank line is a file to load, in order
+- `## Interface:` may list several comma-separated interface versions
+
+An addon can ship a TOC per game flavor (`<Addon>_Classic.toc`, ...) next
+to, or instead of, `<Addon>.toc`; `addon_packages` maps them to the
+flavors each one serves, for per-flavor packaging.
+
+A parsed TOC can be saved as a small JSON file, so later jobs in a pipeline
+load it instead of parsing again. The JSON records the TOC's SHA-256;
+`load_toc` ignores it and re-parses if the TOC on disk has changed since.
+
+Usage:
+    python3 toc_model.py SpectrumFederation --json build/toc.json
+    python3 toc_model.py SpectrumFederation --get version
+    python3 toc_model.py SpectrumFederation --from-json build/toc.json --get interface
+    python3 toc_model.py SpectrumFederation --set Version=1.2.3
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+
+DIRECTIVE_PATTERN = re.compile(r"^##\s*([^:]+?)\s*:\s*(.*?)\s*$")
+
+# Used by load_toc when no path is passed, e.g. `TOC_JSON=build/toc.json`
+TOC_JSON_ENV = "TOC_JSON"
+
+# WowUp release.json flavor served by `<Addon>_<Suffix>.toc` (suffix matched case-insensitively)
+TOC_SUFFIX_FLAVORS = {
+    "mainline": "mainline",
+    "classic": "classic",
+    "vanilla": "classic",
+    "tbc": "bcc",
+    "bcc": "bcc",
+    "wrath": "wrath",
+    "wotlkc": "wrath",
+    "cata": "cata",
+    "mists": "mists"
+}
+
+# Flavor of an interface version by its major version (interface // 10000); anything else is mainline
+INTERFACE_FLAVORS = {1: "classic", 2: "bcc", 3: "wrath", 4: "cata", 5: "mists"}
+MAINLINE = "mainline"
+FLAVOR_ORDER = ("mainline", "classic", "bcc", "wrath", "cata", "mists")
+
+
+class Toc(namedtuple("Toc", ["path", "sha256", "directives", "files"])):
+    """
+    Parsed TOC.
+
+    Fields:
+        path: TOC file path (as given when parsing)
+        sha256: SHA-256 of the TOC content
+        directives: {key: value} of `## Key: value` lines, in file order
+        files: ((line_number, path), ...) of the files to load, in order
+    """
+
+    __slots__ = ()
+
+    def get(self, name, default=None):
+        """Return a directive's value, matching the key case-insensitively."""
+        name = name.casefold()
+        for key, value in self.directives.items():
+            if key.casefold() == name:
+                return value
+        return default
+
+    @property
+    def version(self):
+        return self.get("Version")
+
+    @property
+    def title(self):
+        return self.get("Title")
+
+    @property
+    def interfaces(self):
+        """Interface versions as ints; empty if missing or not all numeric."""
+        return parse_interfaces(self.get("Interface", ""))
+
+    @property
+    def file_paths(self):
+        return [path for _, path in self.files]
+
+
+def parse_interfaces(value):
+    """Parse `110207, 110205` into (110207, 110205); return () unless every part is numeric."""
+    parts = [part.strip() for part in value.split(",")]
+    if not value.strip() or not all(part.isdigit() for part in parts):
+        return ()
+    return tuple(int(part) for part in parts)
+
+
+def parse_toc_text(text, path=""):
+    """
+    Parse TOC content.
+
+    Args:
+        text: TOC file content
+        path: Path recorded in the result
+
+    Returns:
+        Toc
+    """
+    directives = {}
+    seen = set()
+    files = []
+    for line_number, line in enumerate(text.lstrip("\ufeff").splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            match = DIRECTIVE_PATTERN.match(line)
+            if match and match.group(1).casefold() not in seen:
+                seen.add(match.group(1).casefold())
+                directives[match.group(1)] = match.group(2)
+            continue
+        files.append((line_number, line))
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return Toc(str(path), digest, directives, tuple(files))
+
+
+def parse_toc(path):
+    """
+    Parse a TOC file.
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    # Decoded from bytes (no newline translation) so sha256 matches the file on disk
+    return parse_toc_text(Path(path).read_bytes().decode("utf-8"), path)
+
+
+def toc_path_for(addon_name):
+    return Path(addon_name) / f"{addon_name}.toc"
+
+
+# One package per TOC file. suffix names its zip ("" for the plain name);
+# flavors maps each flavor it serves to its interface (None if the TOC has none).
+Package = namedtuple("Package", ["toc", "suffix", "flavors"])
+
+
+def interface_flavor(interface):
+    return INTERFACE_FLAVORS.get(interface // 10000, MAINLINE)
+
+
+def _flavor_interfaces(interfaces):
+    """Group interface versions by flavor, keeping the highest of each."""
+    flavors = {}
+    for interface in interfaces:
+        flavor = interface_flavor(interface)
+        flavors[flavor] = max(interface, flavors.get(flavor, 0))
+    return flavors
+
+
+def addon_packages(addon_dir):
+    """
+    Return one Package per TOC file in an addon directory.
+
+    `<Addon>_<Suffix>.toc` serves its suffix's flavor. `<Addon>.toc` serves
+    every flavor in its `## Interface:` list that has no TOC of its own
+    (mainline if it lists none); if that leaves nothing, it gets no package
+    of its own and just ships in every package. TOCs with unknown suffixes
+    are ignored.
+
+    Args:
+        addon_dir: Addon directory
+
+    Returns:
+        list: Packages, `<Addon>.toc` first, then in FLAVOR_ORDER; a single
+        package always has suffix ""
+
+    Raises:
+        OSError: If a TOC file cannot be read
+    """
+    addon_dir = Path(addon_dir)
+    addon_name = addon_dir.resolve().name
+    fallback = None
+    packages = {}
+    for path in sorted(addon_dir.glob("*.toc")):
+        stem = path.stem
+        if stem == addon_name:
+            fallback = parse_toc(path)
+            continue
+        prefix, sep, suffix = stem.partition("_")
+        flavor = TOC_SUFFIX_FLAVORS.get(suffix.casefold())
+        if prefix != addon_name or not sep or flavor is None or flavor in packages:
+            continue
+        toc = parse_toc(path)
+        interfaces = toc.interfaces
+        interface = _flavor_interfaces(interfaces).get(flavor, max(interfaces, default=None))
+        packages[flavor] = Package(toc, flavor, {flavor: interface})
+
+    ordered = [packages[flavor] for flavor in FLAVOR_ORDER if flavor in packages]
+    if fallback is not None:
+        flavors = _flavor_interfaces(fallback.interfaces) or {MAINLINE: None}
+        flavors = {f: flavors[f] for f in FLAVOR_ORDER if f in flavors and f not in packages}
+        if flavors:
+            ordered.insert(0, Package(fallback, "", flavors))
+    if len(ordered) == 1:
+        ordered[0] = ordered[0]._replace(suffix="")
+    return ordered
+
+
+def to_json(toc):
+    """Return a JSON-serializable dict for a Toc (with derived fields for shell consumers)."""
+    return {
+        "path": toc.path,
+        "sha256": toc.sha256,
+        "directives": toc.directives,
+        "files": [{"line": line, "path": path} for line, path in toc.files],
+        "version": toc.version,
+        "interfaces": list(toc.interfaces)
+    }
+
+
+def write_toc_json(toc, json_path):
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(to_json(toc), f, indent=2)
+        f.write("\n")
+
+
+def read_toc_json(json_path):
+    """
+    Load a Toc saved by write_toc_json.
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is not a saved TOC
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    try:
+        files = tuple((entry["line"], entry["path"]) for entry in data["files"])
+        return Toc(data["path"], data["sha256"], dict(data["directives"]), files)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"{json_path} is not a saved TOC: {e}") from e
+
+
+def load_toc(addon_name, json_path=None):
+    """
+    Return the addon's parsed TOC, from a saved JSON file when it is current.
+
+    Args:
+        addon_name: Addon directory name (the TOC is <addon>/<addon>.toc)
+        json_path: Saved TOC (default: $TOC_JSON); missing, invalid or stale files are ignored
+
+    Returns:
+        Toc
+
+    Raises:
+        OSError: If the TOC has to be parsed and cannot be read
+    """
+    toc_path = toc_path_for(addon_name)
+    json_path = json_path or os.environ.get(TOC_JSON_ENV)
+    if json_path and Path(json_path).is_file():
+        try:
+            saved = read_toc_json(json_path)
+        except (OSError, ValueError):
+            saved = None
+        if saved is not None:
+            try:
+                content = toc_path.read_bytes()
+            except FileNotFoundError:
+                return saved  # TOC not checked out; the saved copy is all there is
+            if hashlib.sha256(content).hexdigest() == saved.sha256:
+                return saved
+    return parse_toc(toc_path)
+
+
+def set_directive(toc_path, name, value):
+    """
+    Set a directive's value in a TOC file, keeping every other line as is.
+
+    The first `## Name:` line (matched case-insensitively) is rewritten; if
+    there is none, the directive is added after the last directive line.
+    """
+    # newline="" keeps CRLF line endings as they are
+    with open(toc_path, "r", encoding="utf-8", newline="") as f:
+        lines = f.read().splitlines(keepends=True)
+    last_directive = -1
+    for index, line in enumerate(lines):
+        match = DIRECTIVE_PATTERN.match(line.strip())
+        if not match:
+            continue
+        last_directive = index
+        if match.group(1).casefold() == name.casefold():
+            ending = line[len(line.rstrip("\r\n")):]
+            lines[index] = f"## {match.group(1)}: {value}{ending}"
+            break
+    else:
+        ending = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
+        lines.insert(last_directive + 1, f"## {name}: {value}{ending}")
+    with open(toc_path, "w", encoding="utf-8", newline="") as f:
+        f.write("".join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parse the addon TOC, save it as JSON, or read and set directives"
+    )
+    parser.add_argument("addon_name", nargs="?", default="SpectrumFederation",
+                        help="Addon directory name (default: SpectrumFederation)")
+    parser.add_argument("--json", help="Write the parsed TOC to this JSON file")
+    parser.add_argument("--from-json", help="Use this saved TOC if it is current")
+    parser.add_argument("--get", help="Print one value: 'version', 'interface' (first), 'interfaces' or a directive name")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Set a directive in the TOC file (repeatable)")
+
+    args = parser.parse_args()
+
+    toc_path = toc_path_for(args.addon_name)
+    try:
+        for assignment in args.set:
+            name, sep, value = assignment.partition("=")
+            if not sep or not name.strip():
+                print(f"::error ::--set expects KEY=VALUE, got '{assignment}'")
+                return 1
+            set_directive(toc_path, name.strip(), value.strip())
+        toc = load_toc(args.addon_name, args.from_json)
+    except OSError as e:
+        print(f"::error ::Cannot read TOC: {e}")
+        return 1
+
+    if args.json:
+        write_toc_json(toc, args.json)
+        print(f"[toc-model] ✓ Wrote {args.json}", file=sys.stderr)
+
+    if args.get:
+        key = args.get.casefold()
+        if key == "interface":
+            value = str(toc.interfaces[0]) if toc.interfaces else None
+        elif key == "interfaces":
+            value = ",".join(str(i) for i in toc.interfaces) or None
+        else:
+            value = toc.get(args.get)
+        if value is None:
+            print(f"::error ::No '{args.get}' in {toc_path}", file=sys.stderr)
+            return 1
+        print(value)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,8 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+from toc_model import load_toc, toc_path_for
+
 def main():
     # Get environment variables
     github_token = os.environ.get("GITHUB_TOKEN")
@@ -28,19 +30,12 @@ def main():
         print("Error: GITHUB_TOKEN environment variable not set")
         sys.exit(1)
     
-    # Read current version from TOC
-    toc_path = Path("SpectrumFederation/SpectrumFederation.toc")
-    if not toc_path.exists():
-        print(f"Error: TOC file not found at {toc_path}")
+    # Read current version from TOC (or the saved TOC in $TOC_JSON)
+    try:
+        version = load_toc("SpectrumFederation").version
+    except FileNotFoundError:
+        print(f"Error: TOC file not found at {toc_path_for('SpectrumFederation')}")
         sys.exit(1)
-        
-    toc_content = toc_path.read_text(encoding="utf-8")
-    
-    version = None
-    for line in toc_content.split("\n"):
-        if line.strip().startswith("## Version:"):
-            version = line.split(":", 1)[1].strip()
-            break
     
     if not version:
         print("Error: Could not find version in TOC file")
@@ -4,18 +4,36 @@ Validate WoW addon package structure for WowUp and CurseForge compatibility.
 
 Checks:
 - Addon directory exists at repo root
-- TOC file exists and is correctly named
-- TOC file has valid Interface field
-- Test zip has correct structure
+- TOC files exist and are correctly named: <addon>.toc and/or one per
+  game flavor (<addon>_Classic.toc, ...)
+- Each TOC file has a valid Interface field
+- Media textures are readable TGAs with power-of-two dimensions
+- Package zip has correct structure
+- Every file the TOC loads exists with the exact same case on disk and in
+  the zip, and every Lua file is loaded (see toc_index.py)
+
+The validated zips are the release artifacts: each is written to
+build/<addon>.zip (build/<addon>-<flavor>.zip for each flavor TOC) with a
+manifest (build/<addon>[-<flavor>].manifest.json), and
+publish_release.py --artifact uploads exactly those bytes.
 """
 
 import argparse
-import re
-import subprocess
 import sys
 import zipfile
 from pathlib import Path
 
+import addon_media
+from addon_packer import (
+    DEFAULT_BUILD_CACHE_DIR,
+    cached_addon_zips,
+    manifest_path_for,
+    package_outputs,
+    write_manifest
+)
+from toc_index import Problem, build_index
+from toc_model import TOC_SUFFIX_FLAVORS, addon_packages
+
 
 def validate_addon_directory(addon_name):
     """Verify addon directory exists."""
@@ -27,79 +45,100 @@ def validate_addon_directory(addon_name):
     return True
 
 
-def validate_toc_file(addon_name):
-    """Verify TOC file exists and is correctly named."""
-    toc_file = Path(addon_name) / f"{addon_name}.toc"
-    
-    if not toc_file.exists():
-        print(f"::error ::TOC file '{toc_file}' not found")
+def validate_toc_files(addon_name):
+    """Verify TOC files exist and are correctly named; return one package per TOC file."""
+    try:
+        packages = addon_packages(addon_name)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"::error ::Failed to read TOC files in '{addon_name}': {e}")
         return False, None
     
-    print(f"[validate-packaging] Using TOC file: {toc_file}")
-    
-    # Validate TOC name vs folder name
-    toc_base = toc_file.name
-    if not (toc_base == f"{addon_name}.toc" or toc_base.startswith(f"{addon_name}_")):
-        print(f"::error ::TOC file '{toc_base}' does not start with addon folder name '{addon_name}'")
-        print("          This may fail on CurseForge or in-game")
+    if not packages:
+        print(f"::error ::No TOC file found in '{addon_name}'")
+        print(f"          Expected '{addon_name}.toc' or '{addon_name}_<Flavor>.toc' "
+              f"(Flavor: {', '.join(sorted(TOC_SUFFIX_FLAVORS, key=str.lower))}, any case)")
         return False, None
     
-    print(f"[validate-packaging] TOC file name '{toc_base}' is valid for folder '{addon_name}'")
-    return True, toc_file
+    for package in packages:
+        flavors = ", ".join(package.flavors)
+        print(f"[validate-packaging] Using TOC file: {package.toc.path} ({flavors})")
+    
+    return True, packages
 
 
-def validate_interface_field(toc_file):
-    """Verify TOC has valid Interface field."""
-    content = toc_file.read_text(encoding="utf-8")
+def validate_interface_field(toc):
+    """Verify TOC has valid Interface field (one or more comma-separated numbers)."""
+    interface_value = toc.get("Interface")
     
-    # Find Interface line
-    interface_pattern = re.compile(r"^## Interface:\s*(.+)$", re.MULTILINE)
-    match = interface_pattern.search(content)
+    if interface_value is None:
+        print(f"::error ::No '## Interface:' line found in {toc.path}")
+        return False
     
-    if not match:
-        print(f"::error ::No '## Interface:' line found in {toc_file}")
+    if not toc.interfaces:
+        print(f"::error ::Interface value '{interface_value}' in {toc.path} does not look numeric")
         return False
     
-    interface_value = match.group(1).strip()
+    print(f"[validate-packaging] Interface value '{interface_value}' looks OK")
+    return True
+
+
+def validate_media(addon_name):
+    """Verify media textures and report media the package will leave out."""
+    addon_dir = Path(addon_name)
+    files = sorted(p for p in addon_dir.rglob("*") if p.is_file() and ".git" not in p.parts)
+    
+    valid = True
+    textures = 0
+    for path in files:
+        if path.suffix.lower() != ".tga":
+            continue
+        textures += 1
+        for problem in addon_media.check_texture(path):
+            print(f"::error file={path}::{problem}")
+            valid = False
     
-    # Validate it looks numeric (may have commas for multiple interfaces)
-    if not re.match(r"^[0-9,\s]+$", interface_value):
-        print(f"::error ::Interface value '{interface_value}' in {toc_file} does not look numeric")
+    if not valid:
+        print("          WoW only loads textures with power-of-two dimensions")
         return False
     
-    print(f"[validate-packaging] Interface value '{interface_value}' looks OK")
+    relative_paths = [p.relative_to(addon_dir).as_posix() for p in files]
+    references = addon_media.find_media_references(files)
+    for relative in addon_media.unreferenced_media(relative_paths, references):
+        print(f"[validate-packaging] Media file '{relative}' is not referenced by any Lua, XML or TOC file; "
+              "it will not be packaged")
+    
+    print(f"[validate-packaging] {textures} texture(s) look OK")
     return True
 
 
-def create_test_zip(addon_name):
-    """Create test zip for structure validation."""
+def create_packages(addon_name, packages, cache_dir=DEFAULT_BUILD_CACHE_DIR):
+    """Build one package zip per TOC file in a single pass, reusing cached builds of the same tree."""
     build_dir = Path("build")
     build_dir.mkdir(exist_ok=True)
     
-    zip_name = f"{addon_name}-validation.zip"
-    zip_path = build_dir / zip_name
+    outputs = package_outputs(build_dir / f"{addon_name}.zip", packages)
     
-    # Remove old zip if exists
-    if zip_path.exists():
-        zip_path.unlink()
+    # Remove old zips and their manifests if they exist
+    for zip_path in outputs:
+        for stale in (zip_path, manifest_path_for(zip_path)):
+            if stale.exists():
+                stale.unlink()
     
-    print(f"[validate-packaging] Creating test zip: {zip_path}")
+    print(f"[validate-packaging] Building package(s): {', '.join(str(p) for p in outputs)}")
     
-    # Create zip using subprocess (matches existing script behavior)
     try:
-        subprocess.run(
-            ["zip", "-r", str(zip_path), addon_name],
-            check=True,
-            capture_output=True
-        )
-    except subprocess.CalledProcessError as e:
-        print(f"::error ::Failed to create test zip: {e}")
+        results = cached_addon_zips(addon_name, outputs, cache_dir)
+    except OSError as e:
+        print(f"::error ::Failed to create package zip: {e}")
         return False, None
     
-    return True, zip_path
+    if all(hit for _, hit in results.values()):
+        print("[validate-packaging] Reused cached build of unchanged addon tree")
+    
+    return True, list(outputs)
 
 
-def validate_zip_structure(zip_path, addon_name, toc_file):
+def validate_zip_structure(zip_path, addon_name, toc_name):
     """Verify zip has correct structure for WowUp/CurseForge."""
     with zipfile.ZipFile(zip_path, 'r') as zf:
         all_files = zf.namelist()
@@ -117,12 +156,45 @@ def validate_zip_structure(zip_path, addon_name, toc_file):
         return False
     
     # Verify TOC file is in the zip
-    toc_in_zip = f"{addon_name}/{toc_file.name}"
+    toc_in_zip = f"{addon_name}/{toc_name}"
     if toc_in_zip not in all_files:
         print(f"::error ::TOC file '{toc_in_zip}' not found inside zip")
         return False
     
-    print("[validate-packaging] Zip structure looks good for WowUp and CurseForge")
+    print(f"[validate-packaging] {zip_path} structure looks good for WowUp and CurseForge")
+    return True
+
+
+def validate_file_index(addon_name, packages, zip_paths):
+    """Verify each TOC's entries against the files on disk and in its zip, case-sensitively."""
+    indexes = [build_index(addon_name, package.toc, zip_path) for package, zip_path in zip(packages, zip_paths)]
+    
+    # A Lua file only one flavor loads is fine; report files that no TOC loads
+    unloaded = set.intersection(*(set(index.unloaded()) for index in indexes))
+    toc_names = " or ".join(index.toc_name for index in indexes)
+    problems = [Problem("error", path, None, f"not loaded by {toc_names} or any XML file they list")
+                for path in sorted(unloaded)]
+    for index in indexes:
+        problems += index.problems(include_unloaded=False)
+    
+    valid = True
+    reported = set()
+    for problem in problems:
+        if problem in reported:
+            continue  # Shared files are checked once per TOC
+        reported.add(problem)
+        location = f"file={Path(addon_name) / problem.path}"
+        if problem.line:
+            location += f",line={problem.line}"
+        print(f"::{problem.level} {location}::{problem.message}")
+        valid = valid and problem.level != "error"
+    
+    if not valid:
+        print("          Files that do not match the TOC exactly are skipped at load time on case-sensitive systems")
+        return False
+    
+    for index, zip_path in zip(indexes, zip_paths):
+        print(f"[validate-packaging] {index.toc_name} entries match the files on disk and in {zip_path}")
     return True
 
 
@@ -135,6 +207,16 @@ def main():
         default="SpectrumFederation",
         help="Name of the addon (default: SpectrumFederation)"
     )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_BUILD_CACHE_DIR,
+        help=f"Build cache directory (default: {DEFAULT_BUILD_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always rebuild the zip instead of reusing a cached build"
+    )
     
     args = parser.parse_args()
     
@@ -144,20 +226,40 @@ def main():
     if not validate_addon_directory(args.addon_name):
         sys.exit(1)
     
-    success, toc_file = validate_toc_file(args.addon_name)
+    success, packages = validate_toc_files(args.addon_name)
     if not success:
         sys.exit(1)
     
-    if not validate_interface_field(toc_file):
+    # Validate every package before failing, so each one's errors are reported
+    interfaces_valid = [validate_interface_field(package.toc) for package in packages]
+    if not all(interfaces_valid):
+        sys.exit(1)
+    
+    if not validate_media(args.addon_name):
         sys.exit(1)
     
-    success, zip_path = create_test_zip(args.addon_name)
+    success, zip_paths = create_packages(args.addon_name, packages, None if args.no_cache else args.cache_dir)
     if not success:
         sys.exit(1)
     
-    if not validate_zip_structure(zip_path, args.addon_name, toc_file):
+    toc_names = [Path(package.toc.path).name for package in packages]
+    zips_valid = [validate_zip_structure(z, args.addon_name, t) for z, t in zip(zip_paths, toc_names)]
+    if not all(zips_valid):
+        sys.exit(1)
+    
+    if not validate_file_index(args.addon_name, packages, zip_paths):
         sys.exit(1)
     
+    # Only zips that passed validation get a manifest, so only they can be published
+    for package, zip_path in zip(packages, zip_paths):
+        try:
+            manifest = write_manifest(zip_path, args.addon_name, validated=True, flavors=package.flavors)
+        except OSError as e:
+            print(f"::error ::Failed to write package manifest: {e}")
+            sys.exit(1)
+        
+        print(f"[validate-packaging] Package: {zip_path} (sha256 {manifest['sha256']})")
+    
     print("[validate-packaging] ✅ Validation successful")
     return 0
 
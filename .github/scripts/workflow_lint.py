@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+In-process YAML linting and GitHub Actions structural checks.
+
+Runs yamllint through its Python API instead of the CLI, then checks the
+workflow structure on a single composed YAML node tree per file (nodes keep
+line/column marks, so findings point at the offending key):
+- every `needs` entry names an existing job, and `needs` has no cycles
+- every job has `steps` or calls a reusable workflow with `uses`
+- steps are mappings with known keys, exactly one of `uses`/`run`, unique ids
+- every `uses` is pinned to a ref (`owner/repo@ref`); branch refs are warned about
+
+Findings use yamllint's parsable format, `<path>:<line>:<col>: [<level>] <message> (<rule>)`,
+so lint_all.py caches and replays them like any other linter output.
+
+Usage:
+    python3 workflow_lint.py .github/workflows/*.yml
+"""
+
+import argparse
+import functools
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+try:
+    import yaml
+    import yamllint
+    from yamllint import linter as yamllint_linter
+    from yamllint.config import YamlLintConfig
+except ImportError:
+    yamllint = None
+
+
+YAML_CONFIG = "{extends: relaxed, rules: {line-length: disable}}"
+
+STEP_KEYS = {
+    "id", "if", "name", "uses", "run", "shell", "with", "env",
+    "continue-on-error", "timeout-minutes", "working-directory"
+}
+
+BRANCH_REFS = {"main", "master", "HEAD"}
+
+
+def checker_version():
+    """
+    Return a version string covering yamllint and these structural checks.
+
+    Raises:
+        ImportError: If yamllint is not installed
+    """
+    if yamllint is None:
+        raise ImportError("yamllint is not installed")
+    source = _source_hash()
+    return f"yamllint {yamllint.__version__}; workflow_lint {source}"
+
+
+@functools.cache
+def _source_hash():
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+
+def _mapping(node):
+    """Return {key: (key_node, value_node)} for a mapping node, or None."""
+    if not isinstance(node, yaml.MappingNode):
+        return None
+    return {key.value: (key, value) for key, value in node.value}
+
+
+def _scalars(node):
+    """Return the scalar nodes of a scalar or a sequence of scalars."""
+    if isinstance(node, yaml.ScalarNode):
+        return [node]
+    if isinstance(node, yaml.SequenceNode):
+        return [item for item in node.value if isinstance(item, yaml.ScalarNode)]
+    return []
+
+
+def check_uses(node, report):
+    """Check that an action or reusable workflow reference is pinned."""
+    value = node.value
+    if value.startswith(("./", "docker://")):
+        return
+    if "@" not in value:
+        report(node, f"'{value}' is not pinned to a ref (use owner/repo@ref)")
+    elif value.rsplit("@", 1)[1] in BRANCH_REFS:
+        report(node, f"'{value}' tracks a branch; pin a tag or commit SHA", "warning")
+
+
+def check_steps(job_id, steps_node, report):
+    if not isinstance(steps_node, yaml.SequenceNode):
+        report(steps_node, f"'steps' of job '{job_id}' must be a list")
+        return
+
+    step_ids = set()
+    for step_node in steps_node.value:
+        step = _mapping(step_node)
+        if step is None:
+            report(step_node, f"step in job '{job_id}' must be a mapping")
+            continue
+
+        for key, (key_node, _) in step.items():
+            if key not in STEP_KEYS:
+                report(key_node, f"unknown step key '{key}'")
+
+        if ("uses" in step) == ("run" in step):
+            report(step_node, "step must have exactly one of 'uses' or 'run'")
+        if "uses" in step:
+            check_uses(step["uses"][1], report)
+
+        if "id" in step:
+            id_node = step["id"][1]
+            if id_node.value in step_ids:
+                report(id_node, f"duplicate step id '{id_node.value}' in job '{job_id}'")
+            step_ids.add(id_node.value)
+
+
+def check_workflow(root, report):
+    """
+    Check the structure of one composed workflow document.
+
+    Args:
+        root: Root yaml.Node of the workflow (None for an empty document)
+        report: Callable(node, message, level="error") collecting findings
+    """
+    if root is None:
+        return
+    workflow = _mapping(root)
+    if workflow is None:
+        report(root, "workflow must be a mapping")
+        return
+    if "on" not in workflow:
+        report(root, "workflow has no 'on' trigger")
+    if "jobs" not in workflow:
+        report(root, "workflow has no 'jobs'")
+        return
+
+    jobs = _mapping(workflow["jobs"][1])
+    if jobs is None:
+        report(workflow["jobs"][1], "'jobs' must be a mapping")
+        return
+
+    graph = {}
+    for job_id, (key_node, job_node) in jobs.items():
+        job = _mapping(job_node)
+        if job is None:
+            report(job_node, f"job '{job_id}' must be a mapping")
+            continue
+
+        graph[job_id] = []
+        if "needs" in job:
+            for need in _scalars(job["needs"][1]):
+                if need.value == job_id:
+                    report(need, f"job '{job_id}' needs itself")
+                elif need.value not in jobs:
+                    report(need, f"job '{job_id}' needs unknown job '{need.value}'")
+                else:
+                    graph[job_id].append(need.value)
+
+        if "uses" in job:
+            check_uses(job["uses"][1], report)
+        elif "steps" in job:
+            check_steps(job_id, job["steps"][1], report)
+        else:
+            report(key_node, f"job '{job_id}' has neither 'steps' nor 'uses'")
+
+    # Depth-first search for `needs` cycles; report each cycle once, at the job closing it
+    state = {}
+
+    def visit(job_id):
+        state[job_id] = "visiting"
+        for need in graph.get(job_id, ()):
+            if state.get(need) == "visiting":
+                report(jobs[job_id][0], f"'needs' cycle between jobs '{job_id}' and '{need}'")
+            elif need not in state:
+                visit(need)
+        state[job_id] = "done"
+
+    for job_id in graph:
+        if job_id not in state:
+            visit(job_id)
+
+
+def lint_text(path, text, config):
+    """
+    Lint one file's text with yamllint and the structural checks.
+
+    Returns:
+        list: (line, column, level, message) tuples sorted by position
+    """
+    problems = [
+        (p.line, p.column, p.level, p.message)
+        for p in yamllint_linter.run(text, config, path)
+    ]
+    if any(p[3].startswith("syntax error") for p in problems):
+        return problems
+
+    def report(node, message, level="error"):
+        mark = node.start_mark
+        problems.append((mark.line + 1, mark.column + 1, level, f"{message} (actions)"))
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        for root in yaml.compose_all(text, Loader=loader):
+            check_workflow(root, report)
+    except yaml.YAMLError:
+        pass  # Already reported by yamllint
+    return sorted(problems)
+
+
+@functools.cache
+def _load_config(config):
+    # Parsed once per process; `lint_all.py --watch` relints with the same config
+    return YamlLintConfig(config)
+
+
+def lint_files(files, config=YAML_CONFIG, file_seconds=None):
+    """
+    Lint files in-process; mirrors `yamllint -f parsable` plus the structural checks.
+
+    Args:
+        files: Paths to lint
+        config: yamllint configuration (YAML string)
+        file_seconds: Optional dict that receives {path: seconds} spent on each linted file
+
+    Returns:
+        tuple: (exit_code, stdout_text, stderr_text) like a subprocess run; exit_code is 1
+        if any error was found
+
+    Raises:
+        ImportError: If yamllint is not installed
+    """
+    if yamllint is None:
+        raise ImportError("yamllint is not installed")
+    yaml_config = _load_config(config)
+
+    lines = []
+    failed = False
+    for path in files:
+        if yaml_config.is_file_ignored(path):
+            continue
+        start = time.monotonic()
+        try:
+            problems = lint_text(path, Path(path).read_text(encoding="utf-8"), yaml_config)
+        except (OSError, UnicodeDecodeError) as e:
+            problems = [(1, 1, "error", f"could not read file: {e}")]
+        if file_seconds is not None:
+            file_seconds[path] = time.monotonic() - start
+        for line, column, level, message in problems:
+            lines.append(f"{path}:{line}:{column}: [{level}] {message}")
+            failed = failed or level == "error"
+
+    return (1 if failed else 0), "\n".join(lines) + ("\n" if lines else ""), ""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Lint GitHub workflow files with yamllint and structural checks"
+    )
+    parser.add_argument("files", nargs="+", help="Workflow files to lint")
+    parser.add_argument("--config", default=YAML_CONFIG, help="yamllint configuration (YAML string)")
+
+    args = parser.parse_args()
+
+    try:
+        exit_code, stdout, stderr = lint_files(args.files, args.config)
+    except ImportError as e:
+        print(f"[workflow-lint] ✗ {e}", file=sys.stderr)
+        return 1
+    sys.stdout.write(stdout)
+    if stderr:
+        print(stderr, file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())